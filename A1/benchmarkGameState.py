@@ -0,0 +1,68 @@
+# benchmarkGameState.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Times the game-state work a game does on every turn.
+
+Game.run deep-copies the state once per agent per turn for its observation,
+and every move builds a successor state, so these two costs set the pace of
+a game with quick agents.  Run from this directory:
+
+  python benchmarkGameState.py [layoutName] [repetitions]
+"""
+
+import sys
+import time
+
+import layout
+import pacman
+
+
+def timePerCall(function, repetitions):
+    "Returns the average number of seconds one call of function takes"
+    started = time.time()
+    for i in range(repetitions):
+        function()
+    return (time.time() - started) / repetitions
+
+
+def benchmark(layoutName='originalClassic', repetitions=2000):
+    """
+    Prints the average cost of one deepCopy, one generateSuccessor and one
+    whole turn (a deepCopy and a successor for each agent) on a layout.
+    """
+    board = layout.getLayout(layoutName)
+    state = pacman.GameState()
+    state.initialize(board, board.getNumGhosts())
+    numAgents = state.getNumAgents()
+    moves = [state.getLegalActions(agent)[0] for agent in range(numAgents)]
+
+    def turn():
+        successor = state
+        for agent in range(numAgents):
+            successor.deepCopy()
+            successor = successor.generateSuccessor(agent, moves[agent])
+
+    print('Layout %s, %d agents, %d repetitions' % (layoutName, numAgents, repetitions))
+    print('deepCopy:          %8.1f us' % (timePerCall(state.deepCopy, repetitions) * 1e6))
+    print('generateSuccessor: %8.1f us' % (timePerCall(lambda: state.generateSuccessor(0, moves[0]), repetitions) * 1e6))
+    print('turn:              %8.1f us' % (timePerCall(turn, repetitions) * 1e6))
+
+
+if __name__ == '__main__':
+    name = 'originalClassic'
+    repetitions = 2000
+    if len(sys.argv) > 1: name = sys.argv[1]
+    if len(sys.argv) > 2: repetitions = int(sys.argv[2])
+    benchmark(name, repetitions)
@@ -0,0 +1,138 @@
+# dstarLite.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Incremental closest-dot search on a walls Grid with D* Lite (Koenig and
+Likhachev, 2002).
+
+The search runs backwards from every food cell towards Pacman, so g(cell)
+converges to the maze distance from the cell to its nearest food.  The
+planner keeps its g and rhs values and its queue between calls: when food
+is eaten or Pacman moves, only the cells whose distance actually changed
+are expanded again, instead of searching the whole board from scratch.
+Only unit step costs are supported.
+
+> planner = ClosestDotPlanner(walls, food.asList(), start)
+> path = planner.findPath()
+> planner.updateGoals(food.asList())      # after some food was eaten
+> planner.moveStart(newStart)
+> path = planner.findPath()
+"""
+
+from game import Actions
+from util import IndexedPriorityQueue
+from util import manhattanDistance
+
+INFINITY = float('inf')
+
+
+class ClosestDotPlanner:
+    """
+    D* Lite with the food cells as goals and Pacman's position as the start.
+
+    g holds the last computed distance to the nearest food and rhs its
+    one-step lookahead (0 on food, otherwise 1 + the smallest g of the
+    neighbours).  Cells where the two differ are queued; expanded counts
+    the cells popped from the queue over the planner's whole life.
+    """
+
+    def __init__(self, walls, goals, start):
+        self.walls = walls
+        self.goals = set(goals)
+        self.start = start
+        # km grows by the heuristic distance Pacman moved, so keys queued before a move stay lower bounds.
+        self.km = 0
+        self.g = {}
+        self.rhs = {}
+        self.queue = IndexedPriorityQueue()
+        self.expanded = 0
+        for goal in self.goals:
+            self.rhs[goal] = 0
+            self.queue.push(goal, self._key(goal))
+
+    def updateGoals(self, goals):
+        "Makes goals the set of food cells, repairing the cells that were added or removed"
+        goals = set(goals)
+        for cell in self.goals - goals:
+            self.goals.remove(cell)
+            self._updateCell(cell)
+        for cell in goals - self.goals:
+            self.goals.add(cell)
+            self._updateCell(cell)
+
+    def moveStart(self, start):
+        self.km += manhattanDistance(self.start, start)
+        self.start = start
+
+    def findPath(self):
+        """
+        Returns a shortest list of actions from the start to the nearest
+        food, or None if no food can be reached.
+        """
+        self._computeShortestPath()
+        if self.g.get(self.start, INFINITY) == INFINITY:
+            return None
+
+        # Every cell on the way is consistent now, so walking to the neighbour with the smallest g is optimal.
+        path, cell = [], self.start
+        while cell not in self.goals:
+            nextCell = min(self._neighbours(cell), key=lambda neighbour: self.g.get(neighbour, INFINITY))
+            path.append(Actions.vectorToDirection((nextCell[0] - cell[0], nextCell[1] - cell[1])))
+            cell = nextCell
+        return path
+
+    def _neighbours(self, cell):
+        x, y = cell
+        adjacent = [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]
+        return [(nextx, nexty) for nextx, nexty in adjacent if not self.walls[nextx][nexty]]
+
+    def _key(self, cell):
+        distance = min(self.g.get(cell, INFINITY), self.rhs.get(cell, INFINITY))
+        return (distance + manhattanDistance(self.start, cell) + self.km, distance)
+
+    def _updateCell(self, cell):
+        if cell in self.goals:
+            self.rhs[cell] = 0
+        else:
+            self.rhs[cell] = min([self.g.get(neighbour, INFINITY) + 1 for neighbour in self._neighbours(cell)] +
+                                 [INFINITY])
+
+        if self.g.get(cell, INFINITY) != self.rhs[cell]:
+            self.queue.push(cell, self._key(cell))
+        elif cell in self.queue:
+            self.queue.remove(cell)
+
+    def _computeShortestPath(self):
+        queue, start = self.queue, self.start
+        while not queue.isEmpty() and (queue.heap[0][0] < self._key(start) or
+                                       self.rhs.get(start, INFINITY) != self.g.get(start, INFINITY)):
+            oldKey = queue.heap[0][0]
+            cell = queue.pop()
+            newKey = self._key(cell)
+            self.expanded += 1
+
+            if oldKey < newKey:
+                # Queued before Pacman moved: only its key is stale.
+                queue.push(cell, newKey)
+            elif self.g.get(cell, INFINITY) > self.rhs[cell]:
+                # The cell got closer to food.
+                self.g[cell] = self.rhs[cell]
+                for neighbour in self._neighbours(cell):
+                    self._updateCell(neighbour)
+            else:
+                # The cell got farther from food: forget its distance and let the lookahead rebuild it.
+                self.g[cell] = INFINITY
+                self._updateCell(cell)
+                for neighbour in self._neighbours(cell):
+                    self._updateCell(neighbour)
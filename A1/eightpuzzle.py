@@ -14,6 +14,7 @@
 
 import search
 import random
+import patternDatabase
 
 # Module Classes
 
@@ -33,7 +34,8 @@ class EightPuzzleState:
 
         numbers: a list of integers from 0 to 8 representing an
           instance of the eight puzzle.  0 represents the blank
-          space.  Thus, the list
+          space.  A list of 16 numbers from 0 to 15 makes a fifteen
+          puzzle, and likewise for any other square size.  Thus, the list
 
             [1, 0, 2, 3, 4, 5, 6, 7, 8]
 
@@ -47,14 +49,15 @@ class EightPuzzleState:
             ------------
 
         The configuration of the puzzle is stored in a 2-dimensional
-        list (a list of lists) 'cells'.
+        list (a list of lists) 'cells', with 'size' rows and columns.
         """
+        self.size = int(round(len(numbers) ** 0.5))
         self.cells = []
         numbers = numbers[:] # Make a copy so as not to cause side-effects.
         numbers.reverse()
-        for row in range( 3 ):
+        for row in range( self.size ):
             self.cells.append( [] )
-            for col in range( 3 ):
+            for col in range( self.size ):
                 self.cells[row].append( numbers.pop() )
                 if self.cells[row][col] == 0:
                     self.blankLocation = row, col
@@ -78,8 +81,8 @@ class EightPuzzleState:
         False
         """
         current = 0
-        for row in range( 3 ):
-            for col in range( 3 ):
+        for row in range( self.size ):
+            for col in range( self.size ):
                 if current != self.cells[row][col]:
                     return False
                 current += 1
@@ -99,11 +102,11 @@ class EightPuzzleState:
         row, col = self.blankLocation
         if(row != 0):
             moves.append('up')
-        if(row != 2):
+        if(row != self.size - 1):
             moves.append('down')
         if(col != 0):
             moves.append('left')
-        if(col != 2):
+        if(col != self.size - 1):
             moves.append('right')
         return moves
 
@@ -136,7 +139,7 @@ class EightPuzzleState:
             raise "Illegal Move"
 
         # Create a copy of the current eightPuzzle
-        newPuzzle = EightPuzzleState([0, 0, 0, 0, 0, 0, 0, 0, 0])
+        newPuzzle = EightPuzzleState([0] * (self.size * self.size))
         newPuzzle.cells = [values[:] for values in self.cells]
         # And update it to reflect the move
         newPuzzle.cells[row][col] = self.cells[newrow][newcol]
@@ -155,10 +158,7 @@ class EightPuzzleState:
               EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).result('left')
           True
         """
-        for row in range( 3 ):
-            if self.cells[row] != other.cells[row]:
-                return False
-        return True
+        return self.cells == other.cells
 
     def __hash__(self):
         return hash(str(self.cells))
@@ -168,14 +168,15 @@ class EightPuzzleState:
           Returns a display string for the maze
         """
         lines = []
-        horizontalLine = ('-' * (13))
+        width = len(str(self.size * self.size - 1))
+        horizontalLine = ('-' * ((width + 3) * self.size + 1))
         lines.append(horizontalLine)
         for row in self.cells:
             rowLine = '|'
             for col in row:
                 if col == 0:
                     col = ' '
-                rowLine = rowLine + ' ' + col.__str__() + ' |'
+                rowLine = rowLine + ' ' + col.__str__().rjust(width) + ' |'
             lines.append(rowLine)
             lines.append(horizontalLine)
         return '\n'.join(lines)
@@ -183,22 +184,121 @@ class EightPuzzleState:
     def __str__(self):
         return self.__getAsciiString()
 
+class PuzzleMoveTables:
+    """
+      Move tables for a compact encoding of size x size puzzle states.
+
+      A packed state is a tuple (tiles, blank): 'tiles' is an int holding
+    the number in cell i (cells numbered row by row) in bits
+    [i * bits, (i + 1) * bits), and 'blank' is the cell of the blank.  It
+    hashes and compares in O(1) and takes a few dozen bytes, where an
+    EightPuzzleState holds a list of lists.
+
+      moves[blank] lists the (move, cell) pairs that are legal with the
+    blank in that cell, in the order of EightPuzzleState.legalMoves, 'cell'
+    being where the blank goes.
+
+    >>> tables = PuzzleMoveTables(3)
+    >>> state = tables.pack(EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]))
+    >>> tables.isGoal(tables.result(state, 'left'))
+    True
+    """
+    def __init__(self, size=3):
+        self.size = size
+        self.numCells = size * size
+        self.bits = max(1, (self.numCells - 1).bit_length())
+        self.tileMask = (1 << self.bits) - 1
+        self.moves = []
+        for cell in range(self.numCells):
+            row, col = divmod(cell, size)
+            moves = []
+            if(row != 0):
+                moves.append(('up', cell - size))
+            if(row != size - 1):
+                moves.append(('down', cell + size))
+            if(col != 0):
+                moves.append(('left', cell - 1))
+            if(col != size - 1):
+                moves.append(('right', cell + 1))
+            self.moves.append(moves)
+        self.goal = self.packNumbers(range(self.numCells))
+
+    def packNumbers(self, numbers):
+        "Returns the packed state of a list of numbers, as given to EightPuzzleState"
+        tiles = 0
+        for cell, number in enumerate(numbers):
+            tiles |= number << (cell * self.bits)
+        return tiles, list(numbers).index(0)
+
+    def pack(self, puzzle):
+        "Returns the packed state of an EightPuzzleState"
+        return self.packNumbers([number for row in puzzle.cells for number in row])
+
+    def unpack(self, state):
+        "Returns the EightPuzzleState of a packed state"
+        return EightPuzzleState(self.tilePositions(state, True))
+
+    def tilePositions(self, state, inverse=False):
+        """
+          Returns the cell of every tile, indexed by tile number, or with
+        inverse=True the number in every cell, indexed by cell.
+        """
+        tiles = state[0]
+        numbers = [(tiles >> (cell * self.bits)) & self.tileMask for cell in range(self.numCells)]
+        if inverse:
+            return numbers
+        positions = [0] * self.numCells
+        for cell, number in enumerate(numbers):
+            positions[number] = cell
+        return positions
+
+    def isGoal(self, state):
+        return state == self.goal
+
+    def result(self, state, move):
+        "Returns the packed state after a legal move of the blank"
+        for legalMove, cell in self.moves[state[1]]:
+            if legalMove == move:
+                return self._slide(state, cell)
+        raise Exception('Illegal Move')
+
+    def successors(self, state):
+        "Returns the (successor, move) pairs of a packed state"
+        return [(self._slide(state, cell), move) for move, cell in self.moves[state[1]]]
+
+    def _slide(self, state, cell):
+        # The blank's bits are zero, so moving the tile is one xor to clear it and one or to place it.
+        tiles, blank = state
+        shift = cell * self.bits
+        tile = (tiles >> shift) & self.tileMask
+        return (tiles ^ (tile << shift)) | (tile << (blank * self.bits)), cell
+
 # TODO: Implement The methods in this class
 
 class EightPuzzleSearchProblem(search.SearchProblem):
     """
       Implementation of a SearchProblem for the  Eight Puzzle domain
 
-      Each state is represented by an instance of an eightPuzzle.
+      Each state is represented by an instance of an eightPuzzle.  With
+      packed=True states are instead the compact tuples of PuzzleMoveTables,
+      so many more of them fit in memory; problem.tables.unpack turns one
+      back into an EightPuzzleState.
     """
-    def __init__(self,puzzle):
+    def __init__(self,puzzle,packed=False):
         "Creates a new EightPuzzleSearchProblem which stores search information."
         self.puzzle = puzzle
+        self.tables = None
+        if packed:
+            self.tables = PuzzleMoveTables(puzzle.size)
 
     def getStartState(self):
-        return puzzle
+        if self.tables is not None:
+            return self.tables.pack(self.puzzle)
+        return self.puzzle
 
     def isGoalState(self,state):
+        if self.tables is not None:
+            return self.tables.isGoal(state)
         return state.isGoal()
 
     def getSuccessors(self,state):
@@ -207,6 +307,8 @@ class EightPuzzleSearchProblem(search.SearchProblem):
           each succesor is either left, right, up, or down
           from the original state and the cost is 1.0 for each
         """
+        if self.tables is not None:
+            return [(successor, a, 1) for successor, a in self.tables.successors(state)]
         succ = []
         for a in state.legalMoves():
             succ.append((state.result(a), a, 1))
@@ -221,6 +323,28 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         """
         return len(actions)
 
+def patternDatabaseHeuristic(state, problem=None):
+    """
+      The sum of the disjoint additive pattern databases for the size of
+    the puzzle (see patternDatabase.py).  Admissible and consistent, for the
+    eight puzzle, the fifteen puzzle and any size with default patterns.
+    Packed states need the problem, to read their tiles.
+
+      The tables are built by a breadth first search the first time a size
+    is used and cached on disk, so the first call can take a while.
+    """
+    if isinstance(state, tuple):
+        # A packed state of a problem created with packed=True.
+        size = problem.tables.size
+        tilePositions = problem.tables.tilePositions(state)
+    else:
+        size = state.size
+        tilePositions = [0] * (size * size)
+        for row in range( size ):
+            for col in range( size ):
+                tilePositions[state.cells[row][col]] = row * size + col
+    return sum([database.getCost(tilePositions) for database in patternDatabase.getPatternDatabases(size)])
+
 EIGHT_PUZZLE_DATA = [[1, 0, 2, 3, 4, 5, 6, 7, 8],
                      [1, 7, 8, 2, 3, 4, 5, 6, 0],
                      [4, 3, 2, 7, 0, 5, 1, 6, 8],
@@ -248,15 +372,16 @@ def loadEightPuzzle(puzzleNumber):
     """
     return EightPuzzleState(EIGHT_PUZZLE_DATA[puzzleNumber])
 
-def createRandomEightPuzzle(moves=100):
+def createRandomEightPuzzle(moves=100, size=3):
     """
       moves: number of random moves to apply
+      size: the number of rows and columns (4 for a fifteen puzzle)
 
       Creates a random eight puzzle by applying
       a series of 'moves' random moves to a solved
       puzzle.
     """
-    puzzle = EightPuzzleState([0,1,2,3,4,5,6,7,8])
+    puzzle = EightPuzzleState(range(size * size))
     for i in range(moves):
         # Execute a random legal move
         puzzle = puzzle.result(random.sample(puzzle.legalMoves(), 1)[0])
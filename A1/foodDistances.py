@@ -0,0 +1,135 @@
+# foodDistances.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+The maze distance from every open cell to its nearest food, with the move
+that leads there.
+
+The field is built with one breadth first search started from all food
+cells at once.  Each cell also remembers which food it was reached from, so
+when a food is eaten only the cells that were reached from it are cleared
+and flooded again from the cells around them; new food only floods the
+cells it gets closer to.  Only unit step costs are supported.
+
+> field = FoodDistanceField(walls, food.asList())
+> field.getDistance(position), field.getAction(position)
+> field.getPath(position)                  # the whole way to the nearest food
+> field.updateFood(food.asList())          # after some food was eaten
+"""
+
+from game import Actions
+from game import Directions
+from util import BucketPriorityQueue
+
+INFINITY = float('inf')
+
+
+class FoodDistanceField:
+    """
+    For every cell reached from some food: distances[cell] is the maze
+    distance to the nearest food, actions[cell] the first move towards it
+    (Directions.STOP on food) and sources[cell] the food it leads to.
+    """
+
+    def __init__(self, walls, food):
+        self.walls = walls
+        self.food = set(food)
+        self.distances = {}
+        self.actions = {}
+        self.sources = {}
+
+        queue = BucketPriorityQueue()
+        for cell in self.food:
+            self._reach(cell, 0, Directions.STOP, cell, queue)
+        self._flood(queue)
+
+    def getDistance(self, position):
+        "Returns the maze distance from position to the nearest food, infinity if there is none"
+        return self.distances.get(position, INFINITY)
+
+    def getAction(self, position):
+        "Returns the first move from position towards the nearest food, None if there is none"
+        return self.actions.get(position)
+
+    def getPath(self, position):
+        """
+        Returns a shortest list of actions from position to the nearest food,
+        or None if no food can be reached.
+        """
+        if position not in self.distances:
+            return None
+        path = []
+        while position not in self.food:
+            action = self.actions[position]
+            path.append(action)
+            position = Actions.getSuccessor(position, action)
+            position = (int(position[0]), int(position[1]))
+        return path
+
+    def updateFood(self, food):
+        "Makes food the set of food cells, repairing the cells whose nearest food changed"
+        food = set(food)
+        for cell in self.food - food:
+            self.removeFood(cell)
+        for cell in food - self.food:
+            self.addFood(cell)
+
+    def removeFood(self, cell):
+        self.food.remove(cell)
+
+        # The cells reached from this food form a tree around it; clear all of them.
+        cleared, stack = set([cell]), [cell]
+        while stack:
+            for neighbour in self._neighbours(stack.pop()):
+                if neighbour not in cleared and self.sources.get(neighbour) == cell:
+                    cleared.add(neighbour)
+                    stack.append(neighbour)
+        for position in cleared:
+            del self.distances[position], self.actions[position], self.sources[position]
+
+        # Flood them again from the cells around them that still know their distance.
+        queue = BucketPriorityQueue()
+        for position in cleared:
+            for neighbour in self._neighbours(position):
+                if neighbour in self.distances:
+                    queue.push((neighbour, self.distances[neighbour]), self.distances[neighbour])
+        self._flood(queue)
+
+    def addFood(self, cell):
+        self.food.add(cell)
+        queue = BucketPriorityQueue()
+        self._reach(cell, 0, Directions.STOP, cell, queue)
+        self._flood(queue)
+
+    def _neighbours(self, cell):
+        x, y = cell
+        adjacent = [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]
+        return [(nextx, nexty) for nextx, nexty in adjacent if not self.walls[nextx][nexty]]
+
+    def _reach(self, cell, distance, action, source, queue):
+        self.distances[cell] = distance
+        self.actions[cell] = action
+        self.sources[cell] = source
+        queue.push((cell, distance), distance)
+
+    def _flood(self, queue):
+        # Entries are (cell, distance when pushed); a cell reached again more cheaply leaves a stale entry behind.
+        while not queue.isEmpty():
+            cell, distance = queue.pop()
+            if distance != self.distances.get(cell):
+                continue
+            for neighbour in self._neighbours(cell):
+                if distance + 1 < self.distances.get(neighbour, INFINITY):
+                    action = Actions.vectorToDirection((cell[0] - neighbour[0], cell[1] - neighbour[1]))
+                    self._reach(neighbour, distance + 1, action, self.sources[cell], queue)
@@ -0,0 +1,107 @@
+# foodTour.py
+# -----------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Shortest paths through every food of a maze with the Held-Karp dynamic
+program.
+
+Collecting all the food is a shortest Hamiltonian path from Pacman through
+the food cells, with maze distances between them.  Held-Karp finds it in
+O(2^n * n^2) time for n food, which beats searching the (position, food)
+state space while n is small.  Distances and the moves of each leg come
+from the all-pairs table of mazeDistances.py.
+
+> order, cost = shortestTour(startDistances, distances)
+> path = findFoodPath(gameState.data.layout, start, foodPositions)
+"""
+
+from game import Actions
+import mazeDistances
+
+
+def shortestTour(startDistances, distances):
+    """
+    Returns (order, cost) for the cheapest walk that starts outside the n
+    points, visits each of them once and ends anywhere: startDistances[i] is
+    the cost from the start to point i and distances[i][j] from i to j.
+    """
+    n = len(startDistances)
+    if n == 0:
+        return [], 0
+    infinity = float('inf')
+
+    # cost[mask][i]: the cheapest walk from the start through the points in mask, ending at point i.
+    cost = [[infinity] * n for mask in range(1 << n)]
+    previous = [[None] * n for mask in range(1 << n)]
+    for i in range(n):
+        cost[1 << i][i] = startDistances[i]
+
+    for mask in range(1, 1 << n):
+        row = cost[mask]
+        for i in range(n):
+            if row[i] == infinity:
+                continue
+            for j in range(n):
+                if mask & (1 << j):
+                    continue
+                nextMask = mask | (1 << j)
+                if row[i] + distances[i][j] < cost[nextMask][j]:
+                    cost[nextMask][j] = row[i] + distances[i][j]
+                    previous[nextMask][j] = i
+
+    full = (1 << n) - 1
+    last = min(range(n), key=lambda i: cost[full][i])
+    total = cost[full][last]
+
+    # Walk the choices back from the last point.
+    order, mask = [], full
+    while last is not None:
+        order.append(last)
+        last, mask = previous[mask][last], mask & ~(1 << last)
+    order.reverse()
+    return order, total
+
+
+def findFoodPath(layout, start, foodPositions):
+    """
+    Returns a shortest list of actions from start that passes through every
+    position in foodPositions, or None if one of them cannot be reached.
+    """
+    table = mazeDistances.getMazeDistances(layout)
+    startDistances = [table.getDistance(start, food) for food in foodPositions]
+    distances = [[table.getDistance(food1, food2) for food2 in foodPositions] for food1 in foodPositions]
+    if mazeDistances.UNREACHABLE in startDistances:
+        return None
+
+    order, cost = shortestTour(startDistances, distances)
+    path, position = [], start
+    for i in order:
+        path.extend(_legActions(table, position, foodPositions[i]))
+        position = foodPositions[i]
+    return path
+
+
+def _legActions(table, start, goal):
+    "A shortest list of actions from start to goal, stepping to a neighbour one step closer each time"
+    goalIndex = table.cellIndex[goal]
+    cell = table.cellIndex[start]
+    actions = []
+    while cell != goalIndex:
+        distance = table.getDistanceByIndex(cell, goalIndex)
+        nextCell = [neighbour for neighbour in table.neighbours[cell]
+                    if table.getDistanceByIndex(neighbour, goalIndex) == distance - 1][0]
+        (x, y), (nextx, nexty) = table.cells[cell], table.cells[nextCell]
+        actions.append(Actions.vectorToDirection((nextx - x, nexty - y)))
+        cell = nextCell
+    return actions
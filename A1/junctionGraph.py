@@ -0,0 +1,84 @@
+# junctionGraph.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A walls Grid compiled into a graph of junctions joined by corridors.
+
+A corridor cell has exactly two open neighbours, so a search that reaches it
+can only carry on to the other side.  Every other open cell (a junction, a
+dead end, or a cell the caller pins, like a start or a goal) becomes a node,
+and each corridor between two nodes becomes a single edge that remembers
+its cells and the actions that walk it.  Searching the graph expands only
+nodes; the actions of the edges followed give back the full path.
+
+> graph = JunctionGraph(walls, [start, goal])
+> graph.getEdges(start)              # [(node, actions, cells), ...]
+> JunctionGraph.expandActions([edgeActions, ...])
+"""
+
+from game import Actions
+from game import Directions
+
+
+class JunctionGraph:
+    """
+    edges[node] lists (neighbourNode, actions, cells) for every corridor
+    leaving node: actions walk from node to neighbourNode and cells are the
+    cells entered on the way, the last one being neighbourNode.
+    """
+
+    def __init__(self, walls, keyCells=()):
+        self.walls = walls
+        keyCells = set(keyCells)
+        openCells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+        self.nodes = set(cell for cell in openCells
+                         if cell in keyCells or len(self._neighbours(cell)) != 2)
+        self.edges = dict((node, self._corridorsFrom(node)) for node in self.nodes)
+
+    def getEdges(self, node):
+        return self.edges[node]
+
+    def expandActions(actions):
+        "Flattens a list of edge action sequences into one list of actions"
+        path = []
+        for edgeActions in actions:
+            path.extend(edgeActions)
+        return path
+    expandActions = staticmethod(expandActions)
+
+    def _neighbours(self, cell):
+        "The open cells next to cell, with the action that reaches each"
+        x, y = cell
+        neighbours = []
+        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+            dx, dy = Actions.directionToVector(action)
+            nextx, nexty = int(x + dx), int(y + dy)
+            if 0 <= nextx < self.walls.width and 0 <= nexty < self.walls.height and not self.walls[nextx][nexty]:
+                neighbours.append(((nextx, nexty), action))
+        return neighbours
+
+    def _corridorsFrom(self, node):
+        edges = []
+        for cell, action in self._neighbours(node):
+            previous, actions, cells = node, [action], [cell]
+            # Follow the corridor: a corridor cell has exactly one way on besides the way we came in.
+            while cell not in self.nodes:
+                cell, previous, action = [(nextCell, cell, nextAction) for nextCell, nextAction
+                                          in self._neighbours(cell) if nextCell != previous][0]
+                actions.append(action)
+                cells.append(cell)
+            # A corridor that loops back to where it started never shortens a path.
+            if cell != node:
+                edges.append((cell, tuple(actions), tuple(cells)))
+        return edges
@@ -0,0 +1,93 @@
+# landmarks.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Landmark (ALT) lower bounds on maze distances.
+
+A few landmark cells are picked by farthest-point selection and the maze
+distance from each of them to every open cell is stored as an array of
+unsigned 16-bit ints.  By the triangle inequality, |d(L, a) - d(L, b)| never
+exceeds d(a, b) for any landmark L, so the largest such difference is an
+admissible and consistent estimate of the maze distance between a and b
+that, unlike the Manhattan distance, knows about walls.
+
+Costs O(k * cells) memory instead of the O(cells^2) of mazeDistances.py,
+whose cell numbering and breadth first search it uses.  Tables are kept in
+memory per walls Grid for the current process.
+
+> table = getLandmarks(walls)
+> table.getLowerBound((2,4), (5,6))
+"""
+
+import array
+
+import mazeDistances
+from mazeDistances import UNREACHABLE
+
+LANDMARKS_CACHE = {}
+
+
+class Landmarks:
+    """
+    Maze distances from numLandmarks landmark cells to every open cell of a
+    walls Grid.  Open cells are numbered column by column, like in
+    mazeDistances.MazeDistances; distances[i][cell] is the distance from
+    landmarks[i] to that cell.
+    """
+
+    def __init__(self, walls, numLandmarks=8):
+        self.walls = walls
+        self.cells, self.cellIndex = mazeDistances.openCells(walls)
+        self.neighbours = mazeDistances.cellNeighbours(self.cells, self.cellIndex)
+        self.landmarks = []
+        self.distances = []
+        self._selectLandmarks(numLandmarks)
+
+    def getLowerBound(self, pos1, pos2):
+        "Returns a lower bound on the maze distance between two open positions"
+        index1, index2 = self.cellIndex[pos1], self.cellIndex[pos2]
+        bound = 0
+        for row in self.distances:
+            distance1, distance2 = row[index1], row[index2]
+            # A landmark that cannot reach both cells says nothing about them.
+            if distance1 != UNREACHABLE and distance2 != UNREACHABLE:
+                bound = max(bound, abs(distance1 - distance2))
+        return bound
+
+    def _selectLandmarks(self, numLandmarks):
+        if not self.cells:
+            return
+        # Farthest-point selection: start from the cell farthest from an arbitrary one, then keep adding the cell
+        # farthest from every landmark so far.  Unreachable cells count as infinitely far, so every part of a
+        # disconnected maze gets a landmark.
+        closest = mazeDistances.distancesFrom(self.neighbours, 0)
+        for i in range(min(numLandmarks, len(self.cells))):
+            landmark = max(range(len(self.cells)), key=lambda cell: closest[cell])
+            if i > 0 and closest[landmark] == 0:
+                break
+            row = mazeDistances.distancesFrom(self.neighbours, landmark)
+            self.landmarks.append(self.cells[landmark])
+            self.distances.append(row)
+            if i == 0:
+                closest = row
+            else:
+                closest = array.array('H', map(min, closest, row))
+
+
+def getLandmarks(walls, numLandmarks=8):
+    "Returns the Landmarks table for a walls Grid, building it only once per process"
+    key = (walls, numLandmarks)
+    if key not in LANDMARKS_CACHE:
+        LANDMARKS_CACHE[key] = Landmarks(walls, numLandmarks)
+    return LANDMARKS_CACHE[key]
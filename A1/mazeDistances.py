@@ -0,0 +1,137 @@
+# mazeDistances.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Precomputed maze distances between every pair of open cells of a layout.
+
+The table is built with one breadth first search per open cell and stored as
+a flat array of unsigned 16-bit ints indexed by cell number.  It is built at
+most once per layout: tables are kept in memory for the current process and
+saved under CACHE_DIRECTORY, named after a hash of the layout text, so later
+runs on the same layout only have to read the file back.
+
+> distances = getMazeDistances(gameState.data.layout)
+> distances.getDistance((2,4), (5,6))
+"""
+
+import array
+import hashlib
+import os
+
+import tableCache
+
+# Distance stored for cells that cannot reach each other.
+UNREACHABLE = 0xFFFF
+
+# Set to None to keep tables in memory only.
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'distance_cache')
+
+MAZE_DISTANCES_CACHE = {}
+
+
+class MazeDistances:
+    """
+    All-pairs maze distances over the open cells of a walls Grid.
+
+    Open cells are numbered column by column (x major, then y), the same
+    order used by Grid.packBits.  distances[i * numCells + j] is the length
+    of the shortest path from cell i to cell j.
+    """
+
+    def __init__(self, walls, distances=None):
+        self.walls = walls
+        self.cells, self.cellIndex = openCells(walls)
+        self.numCells = len(self.cells)
+        self.neighbours = cellNeighbours(self.cells, self.cellIndex)
+        if distances is None:
+            distances = self._computeDistances()
+        self.distances = distances
+
+    def _computeDistances(self):
+        distances = array.array('H')
+        for source in range(self.numCells):
+            distances.extend(distancesFrom(self.neighbours, source))
+        return distances
+
+    def getDistance(self, pos1, pos2):
+        "Returns the maze distance between two open positions"
+        return self.distances[self.cellIndex[pos1] * self.numCells + self.cellIndex[pos2]]
+
+    def getDistanceByIndex(self, index1, index2):
+        "Returns the maze distance between two cell numbers"
+        return self.distances[index1 * self.numCells + index2]
+
+    def getDistancesFrom(self, pos):
+        "Returns the row of distances from pos to every cell, indexed by cell number"
+        start = self.cellIndex[pos] * self.numCells
+        return self.distances[start:start + self.numCells]
+
+
+def openCells(walls):
+    """
+    Returns (cells, cellIndex) for a walls Grid: the list of its open cells
+    column by column, and a dict from each of them to its number.
+    """
+    cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+    return cells, dict((cell, i) for i, cell in enumerate(cells))
+
+
+def cellNeighbours(cells, cellIndex):
+    "Returns the numbers of the open neighbours of every cell, as numbered by openCells"
+    neighbours = []
+    for x, y in cells:
+        adjacent = [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]
+        neighbours.append([cellIndex[pos] for pos in adjacent if pos in cellIndex])
+    return neighbours
+
+
+def distancesFrom(neighbours, source):
+    """
+    Returns the maze distance from cell number source to every cell, as an
+    array of unsigned 16-bit ints with UNREACHABLE for cells it cannot reach.
+    """
+    distances = array.array('H', [UNREACHABLE]) * len(neighbours)
+    distances[source] = 0
+    frontier, depth = [source], 0
+    while frontier:
+        depth += 1
+        nextFrontier = []
+        for cell in frontier:
+            for neighbour in neighbours[cell]:
+                if distances[neighbour] == UNREACHABLE:
+                    distances[neighbour] = depth
+                    nextFrontier.append(neighbour)
+        frontier = nextFrontier
+    return distances
+
+
+def layoutKey(layout):
+    "A stable name for a layout, used both in memory and on disk"
+    return hashlib.sha1('\n'.join(layout.layoutText)).hexdigest()
+
+
+def getMazeDistances(layout):
+    """
+    Returns the MazeDistances table for a Layout, building it only if it is
+    neither in memory nor in the on-disk cache.
+    """
+    key = layoutKey(layout)
+    if key not in MAZE_DISTANCES_CACHE:
+        numCells = len(openCells(layout.walls)[0])
+        distances = tableCache.loadTable(CACHE_DIRECTORY, key + '.dist', 'H', numCells * numCells)
+        table = MazeDistances(layout.walls, distances)
+        if distances is None:
+            tableCache.saveTable(CACHE_DIRECTORY, key + '.dist', table.distances)
+        MAZE_DISTANCES_CACHE[key] = table
+    return MAZE_DISTANCES_CACHE[key]
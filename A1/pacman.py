@@ -40,6 +40,7 @@ To play your first game, type 'python pacman.py' from the command line.
 The keys are 'a', 's', 'd', and 'w' to move (or arrow keys).  Have fun!
 """
 from game import GameStateData
+from game import Configuration
 from game import Game
 from game import Directions
 from game import Actions
@@ -120,6 +121,7 @@ class GameState:
         # Book keeping
         state.data._agentMoved = agentIndex
         state.data.score += state.data.scoreChange
+        state.data.updateZobristKey( self.data )
         GameState.explored.add(self)
         GameState.explored.add(state)
         return state
@@ -414,7 +416,9 @@ class GhostRules:
     def decrementTimer( ghostState):
         timer = ghostState.scaredTimer
         if timer == 1:
-            ghostState.configuration.pos = nearestPoint( ghostState.configuration.pos )
+            # A new configuration: the old one is shared with the state this one was copied from.
+            conf = ghostState.configuration
+            ghostState.configuration = Configuration( nearestPoint( conf.pos ), conf.direction )
         ghostState.scaredTimer = max( 0, timer - 1 )
     decrementTimer = staticmethod( decrementTimer )
 
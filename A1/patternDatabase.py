@@ -0,0 +1,159 @@
+# patternDatabase.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Disjoint additive pattern databases for sliding puzzles (see eightpuzzle.py).
+
+The tiles are split into disjoint patterns.  For each pattern, a breadth
+first search backwards from the goal records the fewest moves *of the
+pattern's tiles* needed to reach the goal from every placement of those
+tiles and of the blank, while the other tiles are ignored.  No move is
+counted by two patterns, so the values of all patterns can be added and the
+sum is still an admissible heuristic.  It is consistent too: a move changes
+the value of the pattern of the tile it slides by at most one, and the value
+of every other pattern not at all, since moving the blank past their tiles
+is free.  Keeping only the best value over all blank cells would lose this.
+
+Cells are numbered row by row and the goal has the blank in cell 0 and
+tile t in cell t.  A placement of a k-tile pattern is ranked as a partial
+permutation, and each table is an array of unsigned bytes with one entry
+per placement and blank cell, cells * cells! / (cells - k)! in all.  Tables
+are kept in memory for the current process and saved under CACHE_DIRECTORY
+(see tableCache.py), so later runs only read them back.
+
+> databases = getPatternDatabases(4)               # the fifteen puzzle
+> sum([database.getCost(tilePositions) for database in databases])
+"""
+
+import array
+import collections
+import os
+
+import tableCache
+
+# Cost stored for placements the search has not reached yet.
+UNREACHED = 0xFF
+
+# Set to None to keep tables in memory only.
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pattern_cache')
+
+# The default split of the tiles into patterns for each puzzle size.
+DEFAULT_PATTERNS = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 2, 3), (4, 5, 6, 7), (8, 9, 10, 11), (12, 13, 14, 15)],
+}
+
+PATTERN_DATABASE_CACHE = {}
+
+
+class PatternDatabase:
+    """
+    The fewest moves of the tiles in pattern needed to reach the goal of a
+    size x size puzzle from any placement of them and of the blank.
+    costs[rank * numCells + blank] is that number for the placement with
+    the given rank (see rank) and the blank in cell blank.
+    """
+
+    def __init__(self, size, pattern, costs=None):
+        self.size = size
+        self.pattern = tuple(pattern)
+        self.numCells = size * size
+        self.numPlacements = countPlacements(self.numCells, len(self.pattern))
+        if costs is None:
+            costs = self._computeCosts()
+        self.costs = costs
+
+    def rank(self, positions):
+        """
+        Numbers a placement of the pattern, given as the cell of each of its
+        tiles, from 0 to numPlacements - 1: the cell of the i-th tile counts
+        as its index among the cells not taken by the tiles before it.
+        """
+        rank = 0
+        for i, position in enumerate(positions):
+            smaller = 0
+            for previous in positions[:i]:
+                if previous < position:
+                    smaller += 1
+            rank = rank * (self.numCells - i) + position - smaller
+        return rank
+
+    def getCost(self, tilePositions):
+        "Returns the cost of the pattern, given the cell of every tile (tilePositions[tile], 0 for the blank)"
+        return self.costs[self.rank([tilePositions[tile] for tile in self.pattern]) * self.numCells + tilePositions[0]]
+
+    def _computeCosts(self):
+        size, numCells = self.size, self.numCells
+        neighbours = []
+        for cell in range(numCells):
+            row, col = divmod(cell, size)
+            adjacent = []
+            if row > 0: adjacent.append(cell - size)
+            if row < size - 1: adjacent.append(cell + size)
+            if col > 0: adjacent.append(cell - 1)
+            if col < size - 1: adjacent.append(cell + 1)
+            neighbours.append(adjacent)
+
+        # The search runs over (placement, blank cell), because which tiles can move depends on the blank.  Moving
+        # the blank past another tile is free, so it is a 0-1 breadth first search: free moves go to the front.
+        costs = array.array('B', [UNREACHED]) * (self.numPlacements * numCells)
+        start = tuple(self.pattern)
+        queue = collections.deque([(start, 0, 0)])
+
+        while queue:
+            positions, blank, cost = queue.popleft()
+            index = self.rank(positions) * numCells + blank
+            if costs[index] != UNREACHED:
+                continue
+            costs[index] = cost
+
+            for cell in neighbours[blank]:
+                if cell in positions:
+                    # A pattern tile slides into the blank: one move.
+                    moved = list(positions)
+                    moved[positions.index(cell)] = blank
+                    queue.append((tuple(moved), cell, cost + 1))
+                else:
+                    queue.appendleft((positions, cell, cost))
+        return costs
+
+
+def countPlacements(numCells, numTiles):
+    "The number of ways to put numTiles distinct tiles in numCells cells"
+    count = 1
+    for i in range(numTiles):
+        count *= numCells - i
+    return count
+
+
+def getPatternDatabases(size, patterns=None):
+    """
+    Returns the PatternDatabase of each pattern (by default
+    DEFAULT_PATTERNS[size]), building only those that are neither in
+    memory nor in the on-disk cache.
+    """
+    if patterns is None:
+        patterns = DEFAULT_PATTERNS[size]
+    databases = []
+    for pattern in patterns:
+        key = '%d-%s' % (size, '-'.join([str(tile) for tile in pattern]))
+        if key not in PATTERN_DATABASE_CACHE:
+            length = countPlacements(size * size, len(pattern)) * size * size
+            costs = tableCache.loadTable(CACHE_DIRECTORY, key + '.pdb', 'B', length)
+            database = PatternDatabase(size, pattern, costs)
+            if costs is None:
+                tableCache.saveTable(CACHE_DIRECTORY, key + '.pdb', database.costs)
+            PATTERN_DATABASE_CACHE[key] = database
+        databases.append(PATTERN_DATABASE_CACHE[key])
+    return databases
@@ -62,6 +62,150 @@ class SearchProblem:
         util.raiseNotDefined()
 
 
+class SearchNodeStore:
+    """
+    A table of search nodes shared by the search functions in this file.
+
+    Each node is identified by an integer id and records its state, the id of
+    its parent node, the action taken from the parent and the path cost g.
+    Frontiers only hold node ids, so pushing a successor is O(1) instead of
+    copying the whole path; the action list is rebuilt by following parent
+    ids only once a goal node is popped.
+
+    Custom search functions can use it the same way:
+
+      nodes = SearchNodeStore()
+      root = nodes.add(problem.getStartState())
+      child = nodes.add(successor, root, action, nodes.getCost(root) + stepCost)
+      ...
+      return nodes.getPath(child)
+    """
+
+    def __init__(self):
+        self.states = []
+        self.parents = []
+        self.actions = []
+        self.costs = []
+
+    def add(self, state, parent=None, action=None, cost=0):
+        """
+        Stores a new node and returns its id.  The root node has no parent
+        and no action.
+        """
+        self.states.append(state)
+        self.parents.append(parent)
+        self.actions.append(action)
+        self.costs.append(cost)
+        return len(self.states) - 1
+
+    def getState(self, node):
+        return self.states[node]
+
+    def getParent(self, node):
+        return self.parents[node]
+
+    def getAction(self, node):
+        return self.actions[node]
+
+    def getCost(self, node):
+        return self.costs[node]
+
+    def getPath(self, node):
+        """
+        Returns the list of actions leading from the root to the given node.
+        """
+        path = []
+        while self.parents[node] is not None:
+            path.append(self.actions[node])
+            node = self.parents[node]
+        path.reverse()
+        return path
+
+    def __len__(self):
+        return len(self.states)
+
+
+class SearchStatistics:
+    """
+    Collects counters and timers from one run of a search function that
+    takes a stats argument:
+
+      expanded, generated   states whose successors were requested, and
+                            successors returned
+      duplicates            successors dropped because their state had
+                            already been reached at no higher cost
+      peakFrontier,         largest size of the frontier and of the set of
+      peakClosed            reached (or closed) states
+      successorTime,        seconds spent in problem.getSuccessors and in
+      heuristicTime         the heuristic
+      totalTime             seconds spent in the whole search
+
+    toJson() returns them, plus expansions per second, as a JSON object.
+    """
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.peakFrontier = 0
+        self.peakClosed = 0
+        self.successorTime = 0.0
+        self.heuristicTime = 0.0
+        self.totalTime = 0.0
+        self._startTime = None
+
+    def start(self):
+        import time
+        self._startTime = time.time()
+
+    def stop(self):
+        import time
+        self.totalTime += time.time() - self._startTime
+
+    def timeSuccessors(self, getSuccessors):
+        "Wraps a successor function so that its calls are counted and timed"
+        import time
+
+        def timedSuccessors(state):
+            started = time.time()
+            successors = getSuccessors(state)
+            self.successorTime += time.time() - started
+            self.expanded += 1
+            self.generated += len(successors)
+            return successors
+        return timedSuccessors
+
+    def timeHeuristic(self, heuristic):
+        "Wraps a heuristic so that its calls are timed"
+        import time
+
+        def timedHeuristic(state, problem=None):
+            started = time.time()
+            value = heuristic(state, problem)
+            self.heuristicTime += time.time() - started
+            return value
+        return timedHeuristic
+
+    def update(self, frontierSize, closedSize):
+        self.peakFrontier = max(self.peakFrontier, frontierSize)
+        self.peakClosed = max(self.peakClosed, closedSize)
+
+    def toJson(self):
+        import json
+
+        return json.dumps({
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'duplicates': self.duplicates,
+            'peakFrontier': self.peakFrontier,
+            'peakClosed': self.peakClosed,
+            'successorTime': self.successorTime,
+            'heuristicTime': self.heuristicTime,
+            'totalTime': self.totalTime,
+            'expansionsPerSecond': self.expanded / self.totalTime if self.totalTime > 0 else 0.0,
+        }, sort_keys=True)
+
+
 def tinyMazeSearch(problem):
     """
     Returns a sequence of moves that solves tinyMaze.  For any other maze, the
@@ -73,7 +217,7 @@ def tinyMazeSearch(problem):
     return [s, s, w, s, w, w, s, w]
 
 
-def depthFirstSearch(problem):
+def depthFirstSearch(problem, stats=None):
     """
     Search the deepest nodes in the search tree first.
 
@@ -86,95 +230,159 @@ def depthFirstSearch(problem):
     print "Start:", problem.getStartState()
     print "Is the start a goal?", problem.isGoalState(problem.getStartState())
     print "Start's successors:", problem.getSuccessors(problem.getStartState())
+
+    Like the other search functions, it records its counters in stats if a
+    SearchStatistics is given.
     """
     "*** YOUR CODE HERE ***"
     from util import Stack
 
+    getSuccessors = problem.getSuccessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
+
     s = Stack()
-    # The first element is the current state(position),
-    # the second element will be the path (list of directions) that eventually guides the pacman to the node.
-    s.push([problem.getStartState(), []])
+    # Frontier entries are node ids in the shared node store. Each node remembers its state, its parent and the
+    # action from the parent, so the path (list of directions) is only rebuilt once we reach the destination.
+    nodes = SearchNodeStore()
+    s.push(nodes.add(problem.getStartState()))
 
     # The path which the pacman has visited before. This is designed for the path-checking.
     # Using set instead of list, so we don't worry about adding any duplicated state into visited_path.
     visited_states = set()
 
     while not s.isEmpty():
-        curr_state, path = s.pop()
+        node = s.pop()
+        curr_state = nodes.getState(node)
 
         # Find the destination.
         if problem.isGoalState(curr_state):
-            return path
+            if stats is not None:
+                stats.stop()
+            return nodes.getPath(node)
 
         # Else, keep finding.
         elif curr_state not in visited_states:
             visited_states.add(curr_state)
 
             # new_cost doesn't have any use in this loop.
-            for successor_state, action, new_cost in problem.getSuccessors(curr_state):
+            for successor_state, action, new_cost in getSuccessors(curr_state):
 
                 if successor_state not in visited_states:
-                    # Tried to use path.append(action) here, but it does not work.
-                    s.push([successor_state, path + [action]])
+                    s.push(nodes.add(successor_state, node, action))
+                elif stats is not None:
+                    stats.duplicates += 1
+
+            if stats is not None:
+                stats.update(len(s.list), len(visited_states))
+
+    if stats is not None:
+        stats.stop()
 
 
-def breadthFirstSearch(problem):
+def breadthFirstSearch(problem, stats=None):
     """Search the shallowest nodes in the search tree first."""
     "*** YOUR CODE HERE ***"
     from util import Queue
 
+    getSuccessors = problem.getSuccessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
+
     # The implementation of BFS should be similar with the one of DFS, except that we are now using a Queue,
     # not a Stack.
     q = Queue()
-    # The third element is cost from a parent state to one of its successor_states.
+    # The node store also keeps the cost from the start state to every node.
+    nodes = SearchNodeStore()
     start_state = problem.getStartState()
-    q.push([start_state, [], 0])
+    q.push(nodes.add(start_state))
 
     # Need for the cycle-checking.
     visited_states = {start_state: 0}
 
     # Cycle-checking is based on the algorithm.pdf.
     while not q.isEmpty():
-        curr_state, path, cost = q.pop()
+        node = q.pop()
+        curr_state, cost = nodes.getState(node), nodes.getCost(node)
 
         # We want the optimal path.
         if cost <= visited_states[curr_state]:
 
             if problem.isGoalState(curr_state):
-                return path
+                if stats is not None:
+                    stats.stop()
+                return nodes.getPath(node)
 
-            for successor_state, action, new_cost in problem.getSuccessors(curr_state):
+            for successor_state, action, new_cost in getSuccessors(curr_state):
 
                 if successor_state not in visited_states or cost + new_cost < visited_states[successor_state]:
-                    q.push([successor_state, path + [action], cost + new_cost])
+                    q.push(nodes.add(successor_state, node, action, cost + new_cost))
                     visited_states[successor_state] = cost + new_cost
+                elif stats is not None:
+                    stats.duplicates += 1
+
+            if stats is not None:
+                stats.update(len(q.list), len(visited_states))
+
+    if stats is not None:
+        stats.stop()
 
 
-def uniformCostSearch(problem):
-    """Search the node of least total cost first."""
+def uniformCostSearch(problem, decreaseKey=False, stats=None):
+    """
+    Search the node of least total cost first.
+
+    The frontier is a util.BucketPriorityQueue, which costs O(1) per push
+    and pop while path costs are integers close to each other and falls
+    back to a binary heap otherwise.  With decreaseKey=True the frontier is
+    instead a util.IndexedPriorityQueue holding each state at most once, so
+    it never fills up with stale duplicates.
+    """
     "*** YOUR CODE HERE ***"
-    from util import PriorityQueue
+    from util import BucketPriorityQueue
+
+    if decreaseKey:
+        return _decreaseKeySearch(problem, nullHeuristic, stats)
+
+    getSuccessors = problem.getSuccessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
 
     # PriorityQueue should be used, due to the costs. UCS is similar with the BFS.
-    pq = PriorityQueue()
+    pq = BucketPriorityQueue()
+    nodes = SearchNodeStore()
     start_state = problem.getStartState()
-    pq.push([start_state, [], 0], 0)
+    pq.push(nodes.add(start_state), 0)
 
     visited_states = {start_state: 0}
 
     while not pq.isEmpty():
-        curr_state, path, cost = pq.pop()
+        node = pq.pop()
+        curr_state, cost = nodes.getState(node), nodes.getCost(node)
 
         if cost <= visited_states[curr_state]:
 
             if problem.isGoalState(curr_state):
-                return path
+                if stats is not None:
+                    stats.stop()
+                return nodes.getPath(node)
 
-            for successor_state, action, new_cost in problem.getSuccessors(curr_state):
+            for successor_state, action, new_cost in getSuccessors(curr_state):
 
                 if successor_state not in visited_states or cost + new_cost < visited_states[successor_state]:
-                    pq.push([successor_state, path + [action], cost + new_cost], cost + new_cost)
+                    pq.push(nodes.add(successor_state, node, action, cost + new_cost), cost + new_cost)
                     visited_states[successor_state] = cost + new_cost
+                elif stats is not None:
+                    stats.duplicates += 1
+
+            if stats is not None:
+                stats.update(len(pq), len(visited_states))
+
+    if stats is not None:
+        stats.stop()
 
 
 def nullHeuristic(state, problem=None):
@@ -185,36 +393,626 @@ def nullHeuristic(state, problem=None):
     return 0
 
 
-def aStarSearch(problem, heuristic=nullHeuristic):
-    """Search the node that has the lowest combined cost and heuristic first."""
+class HeuristicCache:
+    """
+    Memoizes a heuristic on the (hashable) search state, so that it is
+    evaluated at most once per state.  With maxSize set the cache keeps only
+    the maxSize most recently used states (LRU); maxSize=0 disables caching
+    and only counts the calls.  Hits and misses are counted for reporting.
+    """
+
+    def __init__(self, heuristic, maxSize=None):
+        import collections
+
+        self.heuristic = heuristic
+        self.maxSize = maxSize
+        self.values = {} if maxSize is None else collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, state, problem=None):
+        if state in self.values:
+            self.hits += 1
+            if self.maxSize is None:
+                return self.values[state]
+            # Re-insert to mark the state as the most recently used one.
+            value = self.values.pop(state)
+            self.values[state] = value
+            return value
+
+        self.misses += 1
+        value = self.heuristic(state, problem)
+        if self.maxSize != 0:
+            self.values[state] = value
+            if self.maxSize is not None and len(self.values) > self.maxSize:
+                self.values.popitem(last=False)
+        return value
+
+
+def aStarSearch(problem, heuristic=nullHeuristic, decreaseKey=False, heuristicCacheSize=None, reportMemory=False,
+                stats=None):
+    """
+    Search the node that has the lowest combined cost and heuristic first.
+
+    decreaseKey=True selects the same duplicate-free frontier as
+    uniformCostSearch, otherwise the frontier is the same bucket queue, used
+    while f values are small integers.
+
+    The heuristic is wrapped in a HeuristicCache of heuristicCacheSize
+    entries (None for unbounded, 0 to disable), which is left on the problem
+    as problem._heuristicCache so its hit/miss counts can be reported.
+
+    reportMemory=True prints how many states the search held in memory, to
+    compare with iterativeDeepeningAStarSearch.
+    """
     "*** YOUR CODE HERE ***"
-    from util import PriorityQueue
+    from util import BucketPriorityQueue
+
+    # The timer sits inside the cache, so that it only measures real heuristic evaluations.
+    if stats is not None:
+        heuristic = stats.timeHeuristic(heuristic)
+    heuristic = HeuristicCache(heuristic, heuristicCacheSize)
+    problem._heuristicCache = heuristic
+
+    if decreaseKey:
+        return _decreaseKeySearch(problem, heuristic, stats, reportMemory)
+
+    getSuccessors = problem.getSuccessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
 
     # Similar with UCS, except that the priority is based on the evaluation function f:
     # f = g: cost of a move(0 at first) + h: Heuristic(0 at end)
-    pq = PriorityQueue()
+    pq = BucketPriorityQueue()
+    nodes = SearchNodeStore()
     start_state = problem.getStartState()
-    pq.push([start_state, [], 0], 0)
+    pq.push(nodes.add(start_state), 0)
 
     visited_states = {start_state: 0}
 
     while not pq.isEmpty():
-        curr_state, path, cost = pq.pop()
+        node = pq.pop()
+        curr_state, cost = nodes.getState(node), nodes.getCost(node)
 
         if cost <= visited_states[curr_state]:
 
             if problem.isGoalState(curr_state):
-                return path
+                if reportMemory:
+                    _printPeakMemory('aStarSearch', len(nodes) + len(visited_states) + len(heuristic.values))
+                if stats is not None:
+                    stats.stop()
+                return nodes.getPath(node)
+
+            for successor_state, action, g_cost in getSuccessors(curr_state):
+                # Evaluate the heuristic once per successor; the cache makes it once per state.
+                f_cost = cost + g_cost + heuristic(successor_state, problem)
+
+                if successor_state not in visited_states or f_cost < visited_states[successor_state]:
+                    # Don't add the heuristic cost to the node's cost, since the node's cost is the g cost from the
+                    # start state to the successor_State.
+                    pq.push(nodes.add(successor_state, node, action, cost + g_cost), f_cost)
+                    visited_states[successor_state] = f_cost
+                elif stats is not None:
+                    stats.duplicates += 1
+
+            if stats is not None:
+                stats.update(len(pq), len(visited_states))
+
+    if reportMemory:
+        _printPeakMemory('aStarSearch', len(nodes) + len(visited_states) + len(heuristic.values))
+    if stats is not None:
+        stats.stop()
+
+
+def iterativeDeepeningAStarSearch(problem, heuristic=nullHeuristic, tableSize=10000, reportMemory=False):
+    """
+    Depth first searches bounded by f = g + h, raising the bound to the
+    smallest f that exceeded it until a goal is found (IDA*).  Only the
+    current path is kept, so memory stays proportional to the solution depth
+    at the price of re-expanding states in every iteration.
+
+    Because grids and puzzles reach the same state along many paths, an
+    optional transposition table remembers the cheapest g seen for up to
+    tableSize states in the current iteration and prunes costlier repeats;
+    tableSize=0 gives plain IDA*.  reportMemory=True prints the peak number
+    of states held, to compare with aStarSearch(..., reportMemory=True).
+    """
+    start_state = problem.getStartState()
+    if problem.isGoalState(start_state):
+        return []
+
+    bound = heuristic(start_state, problem)
+    peak_states = 0
+
+    while True:
+        next_bound = float('inf')
+        table = {}
+
+        # The current path: its states, actions and costs, plus a lazy iterator over each state's successors.
+        path_states, path_actions, path_costs = [start_state], [], [0]
+        on_path = set(path_states)
+        stack = [iter(problem.getSuccessors(start_state))]
+
+        while stack:
+            peak_states = max(peak_states, len(path_states) + len(table))
+
+            for successor_state, action, step_cost in stack[-1]:
+                cost = path_costs[-1] + step_cost
+
+                # Cycles on the current path and costlier repeats from the table are never worth following.
+                if successor_state in on_path or table.get(successor_state, float('inf')) <= cost:
+                    continue
+
+                f_cost = cost + heuristic(successor_state, problem)
+                if f_cost > bound:
+                    next_bound = min(next_bound, f_cost)
+                    continue
+
+                if problem.isGoalState(successor_state):
+                    if reportMemory:
+                        _printPeakMemory('iterativeDeepeningAStarSearch', peak_states)
+                    return path_actions + [action]
+
+                if successor_state in table or len(table) < tableSize:
+                    table[successor_state] = cost
+
+                path_states.append(successor_state)
+                path_actions.append(action)
+                path_costs.append(cost)
+                on_path.add(successor_state)
+                stack.append(iter(problem.getSuccessors(successor_state)))
+                break
+
+            else:
+                # Every successor has been tried: backtrack.
+                stack.pop()
+                on_path.discard(path_states.pop())
+                path_costs.pop()
+                if path_actions:
+                    path_actions.pop()
+
+        if next_bound == float('inf'):
+            if reportMemory:
+                _printPeakMemory('iterativeDeepeningAStarSearch', peak_states)
+            return None
+        bound = next_bound
+
+
+def anytimeAStarSearch(problem, heuristic=nullHeuristic, timeLimit=10.0, initialWeight=3.0, weightStep=0.5):
+    """
+    Anytime Repairing A* (ARA*): a weighted A* on g + w * h that returns a
+    first plan quickly with a large weight w, then lowers w by weightStep and
+    repairs the previous search instead of starting over, until w reaches 1
+    or timeLimit seconds have passed.
+
+    Returns the best plan found.  Its suboptimality bound (its cost divided
+    by a lower bound on the optimal cost; 1.0 means optimal) is left on the
+    problem as problem._suboptimalityBound.  Only a weight whose search ran
+    to completion bounds the plan, so a search cut short by the deadline
+    reports the ratio alone, capped by the last completed weight if any.
+    The first plan is always completed, even if that takes longer than
+    timeLimit.
+    """
+    import time
+    from util import PriorityQueue
+
+    deadline = time.time() + timeLimit
+    heuristic = HeuristicCache(heuristic)
+    start_state = problem.getStartState()
+
+    costs = {start_state: 0}
+    parents = {start_state: None}
+    best_cost, best_path = float('inf'), None
+    if problem.isGoalState(start_state):
+        best_cost, best_path = 0, []
+
+    def key(state, weight):
+        return costs[state] + weight * heuristic(state, problem)
+
+    def pathTo(state):
+        path = []
+        while parents[state] is not None:
+            state, action = parents[state]
+            path.append(action)
+        path.reverse()
+        return path
+
+    # Open states are queued with the g they had when pushed, so entries left behind by a cheaper path are skipped.
+    weight, completed_weight = initialWeight, None
+    open_states, closed_states, inconsistent_states = set([start_state]), set(), set()
+    pq = PriorityQueue()
+    pq.push((start_state, 0), key(start_state, weight))
+
+    while True:
+        # Improve the current plan: expand until no open state could lead to a cheaper one at this weight.
+        interrupted = False
+        while not pq.isEmpty() and pq.heap[0][0] < best_cost:
+            if best_path is not None and time.time() > deadline:
+                interrupted = True
+                break
+            curr_state, cost = pq.pop()
+            if curr_state not in open_states or cost != costs[curr_state]:
+                continue
+            open_states.remove(curr_state)
+            closed_states.add(curr_state)
+
+            for successor_state, action, step_cost in problem.getSuccessors(curr_state):
+                new_cost = cost + step_cost
+                if successor_state in costs and new_cost >= costs[successor_state]:
+                    continue
+                costs[successor_state] = new_cost
+                parents[successor_state] = (curr_state, action)
+
+                if problem.isGoalState(successor_state) and new_cost < best_cost:
+                    best_cost, best_path = new_cost, pathTo(successor_state)
+
+                # States already expanded at this weight wait for the next one instead of being reopened.
+                if successor_state in closed_states:
+                    inconsistent_states.add(successor_state)
+                else:
+                    open_states.add(successor_state)
+                    pq.push((successor_state, new_cost), key(successor_state, weight))
+
+        # The unweighted f of every state that still could be expanded bounds the optimal cost from below, finished
+        # or not; the weight only bounds the plan once its search has finished.
+        if not interrupted:
+            completed_weight = weight
+        frontier = open_states | inconsistent_states
+        if frontier:
+            lower_bound = min(costs[state] + heuristic(state, problem) for state in frontier)
+            bound = float(best_cost) / lower_bound if lower_bound > 0 else float('inf')
+            if completed_weight is not None:
+                bound = min(completed_weight, bound)
+        else:
+            bound = 1.0
+        problem._suboptimalityBound = max(bound, 1.0) if best_path is not None else float('inf')
+
+        if weight <= 1.0 or not frontier or time.time() > deadline:
+            return best_path
+
+        # Next iteration: a smaller weight, with the inconsistent states back on the frontier.
+        weight = max(1.0, weight - weightStep)
+        open_states |= inconsistent_states
+        inconsistent_states, closed_states = set(), set()
+        pq = PriorityQueue()
+        for state in open_states:
+            pq.push((state, costs[state]), key(state, weight))
+
+
+def wavefrontSearch(problem):
+    """
+    Breadth first search that floods a whole frontier at a time with NumPy
+    array shifts over problem.walls (see wavefront.py).
+
+    Works on grid problems with unit step costs whose states are positions:
+    the targets are problem.food when the problem has a food Grid (like
+    AnyFoodSearchProblem), otherwise problem.goal (like PositionSearchProblem).
+    Every cell the wavefront reaches is counted in problem._expanded.
+    """
+    import wavefront
+
+    if 'food' in dir(problem):
+        targets = problem.food.asList()
+    else:
+        targets = [problem.goal]
+    start_state = problem.getStartState()
+
+    # Flood from the targets so that the path can be read off by walking downhill from the start.
+    field = wavefront.distanceField(problem.walls, targets, stopAt=[start_state])
+    if '_expanded' in dir(problem):
+        problem._expanded += wavefront.reachedCount(field)
+    return wavefront.pathDownhill(field, start_state)
+
+
+def bidirectionalSearch(problem):
+    """
+    Breadth first search from the start and from problem.goal at the same
+    time, one whole layer at a time from the side with the smaller frontier,
+    until the two searches meet.
+
+    The problem must expose its single goal state as problem.goal and have
+    reversible successors with unit step costs: either it defines
+    getPredecessors(state), returning (predecessor, action, stepCost) triples
+    where action leads from predecessor to state, or its actions are Pacman
+    directions that game.Actions.reverseDirection can undo.
+    """
+    start_state, goal_state = problem.getStartState(), problem.goal
+    if start_state == goal_state:
+        return []
+
+    # parents[0] maps a forward state to (parent, action from parent); parents[1] maps a backward state to
+    # (child, action to child), so both halves of the path can be read off in forward order.
+    parents = [{start_state: None}, {goal_state: None}]
+    layers = [[start_state], [goal_state]]
+
+    while layers[0] and layers[1]:
+        side = 0 if len(layers[0]) <= len(layers[1]) else 1
+        other = parents[1 - side]
+        next_layer, meeting_states = [], []
+
+        for curr_state in layers[side]:
+            for neighbour, action, step_cost in _neighbours(problem, curr_state, side):
+                if neighbour not in parents[side]:
+                    parents[side][neighbour] = (curr_state, action)
+                    next_layer.append(neighbour)
+                    if neighbour in other:
+                        meeting_states.append(neighbour)
+
+        # Every meeting in this layer has the same forward depth, so pick the one closest to the other side.
+        if meeting_states:
+            depths = [_depth(other, state) for state in meeting_states]
+            return _joinPaths(parents, meeting_states[depths.index(min(depths))])
+        layers[side] = next_layer
+
+
+def bidirectionalAStarSearch(problem, heuristic=nullHeuristic):
+    """
+    Front-to-end bidirectional A*: a forward A* guided by heuristic(state,
+    problem) towards problem.goal and a backward A* guided by the same
+    heuristic towards the start state, expanding the side whose frontier has
+    the lower f first.  It stops once the best path found costs no more than
+    the larger of the two smallest f values, which keeps it optimal for any
+    admissible heuristic: a state already expanded on one side is reopened
+    when that side finds a cheaper path to it, as an inconsistent heuristic
+    allows.
+
+    The problem must satisfy the same conditions as for bidirectionalSearch,
+    except that step costs only need to be the same in both directions.
+    """
+    from util import PriorityQueue
+
+    start_state, goal_state = problem.getStartState(), problem.goal
+    problems = [problem, _ReverseProblem(problem)]
+    parents = [{start_state: None}, {goal_state: None}]
+    costs = [{start_state: 0}, {goal_state: 0}]
+    closed = [set(), set()]
+    frontiers = [PriorityQueue(), PriorityQueue()]
+    frontiers[0].push((start_state, 0), heuristic(start_state, problems[0]))
+    frontiers[1].push((goal_state, 0), heuristic(goal_state, problems[1]))
+
+    best_cost, meeting_state = (0, start_state) if start_state == goal_state else (float('inf'), None)
+
+    while True:
+        min_f = [pq.heap[0][0] if not pq.isEmpty() else float('inf') for pq in frontiers]
+        if best_cost <= max(min_f) or min(min_f) == float('inf'):
+            break
+        side = 0 if min_f[0] <= min_f[1] else 1
+
+        curr_state, cost = frontiers[side].pop()
+        # Skip entries that were superseded by a cheaper path, and states already expanded.
+        if cost > costs[side][curr_state] or curr_state in closed[side]:
+            continue
+        closed[side].add(curr_state)
+
+        for neighbour, action, step_cost in _neighbours(problem, curr_state, side):
+            new_cost = cost + step_cost
+            if neighbour not in costs[side] or new_cost < costs[side][neighbour]:
+                costs[side][neighbour] = new_cost
+                parents[side][neighbour] = (curr_state, action)
+                closed[side].discard(neighbour)
+                frontiers[side].push((neighbour, new_cost), new_cost + heuristic(neighbour, problems[side]))
+                if neighbour in costs[1 - side] and new_cost + costs[1 - side][neighbour] < best_cost:
+                    best_cost, meeting_state = new_cost + costs[1 - side][neighbour], neighbour
+
+    if meeting_state is not None:
+        return _joinPaths(parents, meeting_state)
+
+
+class _ReverseProblem:
+    """
+    The backward view of a problem for bidirectional search: it starts at
+    the goal and its goal is the original start state, so heuristics written
+    against problem.goal estimate the distance back to the start.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.goal = problem.getStartState()
+        self.heuristicInfo = {}
+
+    def getStartState(self):
+        return self.problem.goal
+
+    def __getattr__(self, name):
+        return getattr(self.problem, name)
+
+
+def jumpPointSearch(problem):
+    """
+    Jump Point Search: A* with the Manhattan distance to problem.goal, where
+    a node only stops at jump points, the cells where an optimal path may
+    have to turn, instead of at every open cell.  Straight runs between jump
+    points are scanned directly on problem.walls (a game.Grid) without
+    creating search nodes.
+
+    Works on 4-connected grid problems with unit step costs and a single
+    goal position, like PositionSearchProblem.  Each expanded jump point is
+    counted in problem._expanded, and the result is the full action list.
+
+    Among equally short paths only those that turn vertically as early as
+    possible are followed: moving horizontally, a cell is a jump point when
+    the cell above (or below) it is open but the one diagonally behind it is
+    a wall; moving vertically, a cell is a jump point when a horizontal
+    scan from it finds one.
+    """
+    from game import Actions
+    from util import PriorityQueue, manhattanDistance
+
+    walls, goal = problem.walls, problem.goal
+    start_state = problem.getStartState()
+
+    def isOpen(x, y):
+        return 0 <= x < walls.width and 0 <= y < walls.height and not walls[x][y]
+
+    def forcedTurns(x, y, dx):
+        "The vertical directions a horizontal run moving by dx is forced to try at (x, y)."
+        return [dy for dy in (1, -1) if isOpen(x, y + dy) and not isOpen(x - dx, y + dy)]
+
+    def jump(x, y, dx, dy):
+        "Scans from (x, y) in direction (dx, dy) and returns the next jump point, or None."
+        while True:
+            x, y = x + dx, y + dy
+            if not isOpen(x, y):
+                return None
+            if (x, y) == goal:
+                return x, y
+            if dx != 0:
+                if forcedTurns(x, y, dx):
+                    return x, y
+            elif jump(x, y, 1, 0) is not None or jump(x, y, -1, 0) is not None:
+                return x, y
+
+    def directions(x, y, arrival):
+        if arrival is None:
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        dx, dy = arrival
+        if dx == 0:
+            return [arrival, (1, 0), (-1, 0)]
+        return [arrival] + [(0, forced) for forced in forcedTurns(x, y, dx)]
+
+    # Search nodes are (position, arrival direction), since the directions worth trying depend on both.
+    start_node = (start_state, None)
+    parents = {start_node: None}
+    costs = {start_node: 0}
+    pq = PriorityQueue()
+    pq.push((start_node, 0), manhattanDistance(start_state, goal))
+
+    while not pq.isEmpty():
+        node, cost = pq.pop()
+        if cost > costs[node]:
+            continue
+        (x, y), arrival = node
+
+        if (x, y) == goal:
+            path = []
+            while parents[node] is not None:
+                parent = parents[node]
+                (px, py), (dx, dy) = parent[0], node[1]
+                steps = abs(node[0][0] - px) + abs(node[0][1] - py)
+                path = [Actions.vectorToDirection((dx, dy))] * steps + path
+                node = parent
+            return path
+
+        if '_expanded' in dir(problem):
+            problem._expanded += 1
+
+        for dx, dy in directions(x, y, arrival):
+            jump_point = jump(x, y, dx, dy)
+            if jump_point is None:
+                continue
+            successor = (jump_point, (dx, dy))
+            new_cost = cost + abs(jump_point[0] - x) + abs(jump_point[1] - y)
+            if successor not in costs or new_cost < costs[successor]:
+                costs[successor] = new_cost
+                parents[successor] = node
+                pq.push((successor, new_cost), new_cost + manhattanDistance(jump_point, goal))
+
+
+def _printPeakMemory(name, peak_states):
+    try:
+        import resource
+        resident = ', process peak resident size %d kB' % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        resident = ''
+    print('[%s] peak states held in memory: %d%s' % (name, peak_states, resident))
+
+
+def _neighbours(problem, state, side):
+    "Successors for the forward side (0), predecessors for the backward side (1)."
+    if side == 0:
+        return problem.getSuccessors(state)
+    if 'getPredecessors' in dir(problem):
+        return problem.getPredecessors(state)
+
+    from game import Actions
+    return [(successor, Actions.reverseDirection(action), step_cost)
+            for successor, action, step_cost in problem.getSuccessors(state)]
+
+
+def _depth(parents, state):
+    depth = 0
+    while parents[state] is not None:
+        state = parents[state][0]
+        depth += 1
+    return depth
+
+
+def _joinPaths(parents, meeting_state):
+    "The forward path from the start to meeting_state, followed by the backward path from it to the goal."
+    path, state = [], meeting_state
+    while parents[0][state] is not None:
+        state, action = parents[0][state]
+        path.append(action)
+    path.reverse()
+
+    state = meeting_state
+    while parents[1][state] is not None:
+        state, action = parents[1][state]
+        path.append(action)
+    return path
+
+
+def _decreaseKeySearch(problem, heuristic, stats=None, reportMemory=False):
+    """
+    Best-first search on f = g + h where every state is queued at most once.
+    Finding a cheaper path to a queued state lowers its priority in place
+    (decrease-key) instead of pushing a second entry for it.
+
+    reportMemory=True prints the states held like aStarSearch does.
+    """
+    from util import IndexedPriorityQueue
+
+    getSuccessors = problem.getSuccessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
+
+    pq = IndexedPriorityQueue()
+    nodes = SearchNodeStore()
+    start_state = problem.getStartState()
+
+    # The cheapest node found so far for every generated state; the frontier holds states, not nodes.
+    best_nodes = {start_state: nodes.add(start_state)}
+    pq.push(start_state, heuristic(start_state, problem))
+
+    while not pq.isEmpty():
+        curr_state = pq.pop()
+        node = best_nodes[curr_state]
+
+        if problem.isGoalState(curr_state):
+            if reportMemory:
+                _printPeakMemory('aStarSearch', _decreaseKeyStatesHeld(nodes, best_nodes, heuristic))
+            if stats is not None:
+                stats.stop()
+            return nodes.getPath(node)
+
+        cost = nodes.getCost(node)
+        for successor_state, action, step_cost in getSuccessors(curr_state):
+            new_cost = cost + step_cost
+
+            # A cheaper path re-queues the state: decrease-key if it is still on the frontier, a fresh push if it
+            # was already expanded (only possible with an inconsistent heuristic).
+            if successor_state not in best_nodes or new_cost < nodes.getCost(best_nodes[successor_state]):
+                best_nodes[successor_state] = nodes.add(successor_state, node, action, new_cost)
+                pq.update(successor_state, new_cost + heuristic(successor_state, problem))
+            elif stats is not None:
+                stats.duplicates += 1
+
+        if stats is not None:
+            stats.update(len(pq), len(best_nodes))
+
+    if reportMemory:
+        _printPeakMemory('aStarSearch', _decreaseKeyStatesHeld(nodes, best_nodes, heuristic))
+    if stats is not None:
+        stats.stop()
 
-            for successor_state, action, g_cost in problem.getSuccessors(curr_state):
 
-                if successor_state not in visited_states or \
-                         cost + g_cost + heuristic(successor_state, problem) < visited_states[successor_state]:
-                    # Don't add the heuristic cost to the third element in the list, since the third element is the
-                    # cost between a parent_state and the successor_State.
-                    pq.push([successor_state, path + [action], cost + g_cost],
-                            cost + g_cost + heuristic(successor_state, problem))
-                    visited_states[successor_state] = cost + g_cost + heuristic(successor_state, problem)
+def _decreaseKeyStatesHeld(nodes, best_nodes, heuristic):
+    held = len(nodes) + len(best_nodes)
+    if isinstance(heuristic, HeuristicCache):
+        held += len(heuristic.values)
+    return held
 
 
 # Abbreviations
@@ -222,3 +1020,8 @@ bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+bibfs = bidirectionalSearch
+biastar = bidirectionalAStarSearch
+idastar = iterativeDeepeningAStarSearch
+jps = jumpPointSearch
+arastar = anytimeAStarSearch
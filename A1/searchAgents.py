@@ -37,9 +37,16 @@ Good luck and happy searching!
 from game import Directions
 from game import Agent
 from game import Actions
+from game import Grid
 import util
 import time
 import search
+import mazeDistances
+import dstarLite
+import foodDistances
+import junctionGraph
+import landmarks
+import foodTour
 
 
 class GoWestAgent(Agent):
@@ -69,21 +76,43 @@ class SearchAgent(Agent):
     Options for fn include:
       depthFirstSearch or dfs
       breadthFirstSearch or bfs
+      wavefrontSearch (needs NumPy)
+
+    With stats=<file> (or stats=- for the console) the search function must
+    accept a stats argument; its SearchStatistics are written there as JSON.
+
+    With timeLimit=<seconds> the search function must accept a timeLimit
+    argument, like anytimeAStarSearch (arastar); use it to stay within the
+    game's startup time on large layouts.
 
 
     Note: You should NOT change any code in SearchAgent
     """
 
-    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic'):
+    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic', stats=None,
+                 timeLimit=None):
         # Warning: some advanced Python magic is employed below to find the right functions and problems
 
         # Get the search function from the name and heuristic
         if fn not in dir(search):
             raise AttributeError, fn + ' is not a search function in search.py.'
         func = getattr(search, fn)
+
+        # Optionally collect search statistics, written out in registerInitialState
+        options = {}
+        self.stats, self.statsFile = None, stats
+        if stats is not None:
+            if 'stats' not in func.func_code.co_varnames:
+                raise AttributeError, fn + ' does not collect search statistics.'
+            self.stats = options['stats'] = search.SearchStatistics()
+        if timeLimit is not None:
+            if 'timeLimit' not in func.func_code.co_varnames:
+                raise AttributeError, fn + ' does not take a time limit.'
+            options['timeLimit'] = float(timeLimit)
+
         if 'heuristic' not in func.func_code.co_varnames:
             print('[SearchAgent] using function ' + fn)
-            self.searchFunction = func
+            self.searchFunction = lambda x: func(x, **options)
         else:
             if heuristic in globals().keys():
                 heur = globals()[heuristic]
@@ -93,7 +122,7 @@ class SearchAgent(Agent):
                 raise AttributeError, heuristic + ' is not a function in searchAgents.py or search.py.'
             print('[SearchAgent] using function %s and heuristic %s' % (fn, heuristic))
             # Note: this bit of Python trickery combines the search algorithm and the heuristic
-            self.searchFunction = lambda x: func(x, heuristic=heur)
+            self.searchFunction = lambda x: func(x, heuristic=heur, **options)
 
         # Get the search problem type from the name
         if prob not in globals().keys() or not prob.endswith('Problem'):
@@ -114,9 +143,22 @@ class SearchAgent(Agent):
         starttime = time.time()
         problem = self.searchType(state) # Makes a new search problem
         self.actions  = self.searchFunction(problem) # Find a path
+        if 'expandActions' in dir(problem): self.actions = problem.expandActions(self.actions)
         totalCost = problem.getCostOfActions(self.actions)
         print('Path found with total cost of %d in %.1f seconds' % (totalCost, time.time() - starttime))
         if '_expanded' in dir(problem): print('Search nodes expanded: %d' % problem._expanded)
+        if '_heuristicCache' in dir(problem):
+            cache = problem._heuristicCache
+            print('Heuristic cache hits: %d, misses: %d' % (cache.hits, cache.misses))
+        if '_suboptimalityBound' in dir(problem):
+            print('Suboptimality bound: %.2f' % problem._suboptimalityBound)
+        if 'stats' in dir(self) and self.stats is not None:
+            if self.statsFile == '-':
+                print('Search statistics: ' + self.stats.toJson())
+            else:
+                f = open(self.statsFile, 'w')
+                try: f.write(self.stats.toJson() + '\n')
+                finally: f.close()
 
     def getAction(self, state):
         """
@@ -229,6 +271,43 @@ class PositionSearchProblem(search.SearchProblem):
         return cost
 
 
+class JunctionSearchProblem(PositionSearchProblem):
+    """
+    A PositionSearchProblem over the junction graph of the maze (see
+    junctionGraph.py): its states are only the junctions, dead ends, start
+    and goal, and each successor follows a whole corridor.
+
+    The action of a successor is the tuple of moves along its corridor and
+    its cost the sum of costFn over the cells entered, so any search
+    function works unchanged; expandActions turns its result back into a
+    plain list of moves (SearchAgent does this for you).  Corridors differ
+    in length, so only uniform cost and A* search still find shortest paths.
+    """
+
+    def __init__(self, gameState, costFn = lambda x: 1, goal=(1,1), start=None, warn=True, visualize=True):
+        PositionSearchProblem.__init__(self, gameState, costFn, goal, start, warn, visualize)
+        self.graph = junctionGraph.JunctionGraph(self.walls, [self.startState, self.goal])
+
+    def getSuccessors(self, state):
+        successors = []
+        for nextState, actions, cells in self.graph.getEdges(state):
+            cost = sum([self.costFn(cell) for cell in cells])
+            successors.append((nextState, actions, cost))
+
+        # Bookkeeping for display purposes
+        self._expanded += 1
+        if state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+
+        return successors
+
+    def expandActions(self, actions):
+        "Turns a list of corridor action tuples into the list of moves Pacman makes"
+        if actions == None: return None
+        return junctionGraph.JunctionGraph.expandActions(actions)
+
+
 class StayEastSearchAgent(SearchAgent):
     """
     An agent for position search with a cost function that penalizes being in
@@ -265,6 +344,17 @@ def euclideanHeuristic(position, problem, info={}):
     xy2 = problem.goal
     return ( (xy1[0] - xy2[0]) ** 2 + (xy1[1] - xy2[1]) ** 2 ) ** 0.5
 
+def landmarkHeuristic(position, problem, info={}):
+    """
+    The landmark (ALT) heuristic for a PositionSearchProblem: a lower bound
+    on the maze distance to the goal that accounts for walls (see
+    landmarks.py).  Admissible and consistent for unit step costs.
+    """
+    # Look the table up once per problem, since keying the per-layout cache hashes the whole walls Grid.
+    if '_landmarks' not in dir(problem):
+        problem._landmarks = landmarks.getLandmarks(problem.walls)
+    return problem._landmarks.getLowerBound(position, problem.goal)
+
 #####################################################
 # This portion is incomplete.  Time to write code!  #
 #####################################################
@@ -275,6 +365,12 @@ class CornersProblem(search.SearchProblem):
     This search problem finds paths through all four corners of a layout.
 
     You must select a suitable state space and successor function
+
+    A search state is a tuple ( cellIndex, cornerMask ) where
+      cellIndex:  the number of Pacman's cell in problem.cells, the open
+                  cells numbered column by column
+      cornerMask: a 4-bit int whose bit i is set while problem.corners[i]
+                  has not been visited yet
     """
 
     def __init__(self, startingGameState):
@@ -293,8 +389,30 @@ class CornersProblem(search.SearchProblem):
         # in initializing the problem
         "*** YOUR CODE HERE ***"
 
-        # Tried to make it a list, but list is not hashable, which will cause error.
-        self.start = (self.startingPosition, self.corners)
+        # Number the open cells once, and precompute the legal moves from each cell and the bit of each corner, so
+        # that expanding a state never touches the walls Grid or builds coordinate tuples.
+        self.cells, self.cellIndex = mazeDistances.openCells(self.walls)
+        self.moves = []
+        for x, y in self.cells:
+            moves = []
+            for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+                dx, dy = Actions.directionToVector(action)
+                nextCell = (int(x + dx), int(y + dy))
+                if nextCell in self.cellIndex:
+                    moves.append((self.cellIndex[nextCell], action))
+            self.moves.append(moves)
+        self.cornerBits = [0] * len(self.cells)
+        for i, corner in enumerate(self.corners):
+            if corner in self.cellIndex:
+                self.cornerBits[self.cellIndex[corner]] |= 1 << i
+
+        # Maze distances from every corner to every cell, and the length of the shortest tour through the corners
+        # of each mask starting from each of its corners: cornerTours[mask][i].
+        self.cornerDistances = [self._distancesFrom(corner) for corner in self.corners]
+        self.cornerTours = self._cornerTours()
+
+        startCell = self.cellIndex[self.startingPosition]
+        self.start = (startCell, 0xF & ~self.cornerBits[startCell])
 
     def getStartState(self):
         """
@@ -303,10 +421,8 @@ class CornersProblem(search.SearchProblem):
         """
         "*** YOUR CODE HERE ***"
 
-        # Need include info about the corners in the self-defined state (pacman_position, unexplored_corners).
-        # Once we explored a new corner, we want to remove this corner from unexplored_corners.
-
-        # Tried to return a list, but list is not hashable, which will cause error.
+        # Need include info about the corners in the self-defined state (cell_index, unexplored_corners_mask).
+        # Once we explored a new corner, we clear its bit from unexplored_corners_mask.
         return self.start
 
     def isGoalState(self, state):
@@ -315,7 +431,7 @@ class CornersProblem(search.SearchProblem):
         """
         "*** YOUR CODE HERE ***"
 
-        return len(state[1]) == 0
+        return state[1] == 0
 
     def getSuccessors(self, state):
         """
@@ -328,37 +444,20 @@ class CornersProblem(search.SearchProblem):
             is the incremental cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            # Add a successor state to the successor list if the action is legal
-            # Here's a code snippet for figuring out whether a new position hits a wall:
-            #   x,y = currentPosition
-            #   dx, dy = Actions.directionToVector(action)
-            #   nextx, nexty = int(x + dx), int(y + dy)
-            #   hitsWall = self.walls[nextx][nexty]
-            "*** YOUR CODE HERE ***"
-
-            x, y = state[0]
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-
-            if not self.walls[nextx][nexty]:
-                # Our goal is to remove all corners in the remain_corners.
-                remain_corners = [corner for corner in state[1]]
-                nextState = (nextx, nexty)
-
-                # Find a corner, and remove it.
-                if nextState in remain_corners:
-                    remain_corners.remove(nextState)
-                    successors.append(((nextState, tuple(remain_corners)), action, 1))
+        "*** YOUR CODE HERE ***"
 
-                # Else, nothing to remove. Need continue to find the remain corners.
-                else:
-                    successors.append(((nextState, state[1]), action, 1))
+        # The legal moves were worked out in __init__; entering a corner clears its bit.
+        cell, mask = state
+        cornerBits = self.cornerBits
+        successors = [((nextCell, mask & ~cornerBits[nextCell]), action, 1) for nextCell, action in self.moves[cell]]
 
         self._expanded += 1 # DO NOT CHANGE
         return successors
 
+    def getPosition(self, state):
+        "Returns Pacman's (x,y) position in a search state"
+        return self.cells[state[0]]
+
     def getCostOfActions(self, actions):
         """
         Returns the cost of a particular sequence of actions.  If those actions
@@ -372,6 +471,26 @@ class CornersProblem(search.SearchProblem):
             if self.walls[x][y]: return 999999
         return len(actions)
 
+    def _distancesFrom(self, position):
+        "Maze distances from position to every open cell; unreachable cells are left at 999999"
+        if position not in self.cellIndex:
+            return [999999] * len(self.cells)
+        neighbours = [[nextCell for nextCell, action in moves] for moves in self.moves]
+        distances = mazeDistances.distancesFrom(neighbours, self.cellIndex[position])
+        return [999999 if distance == mazeDistances.UNREACHABLE else distance for distance in distances]
+
+    def _cornerTours(self):
+        between = [[self.cornerDistances[i][self.cellIndex[corner]] if corner in self.cellIndex else 999999
+                    for corner in self.corners] for i in range(4)]
+        tours = [[0] * 4 for mask in range(16)]
+        # Masks only grow by adding bits, so every smaller mask is done before it is needed.
+        for mask in range(1, 16):
+            for i in range(4):
+                rest = mask & ~(1 << i)
+                if mask & (1 << i) and rest:
+                    tours[mask][i] = min([between[i][j] + tours[rest][j] for j in range(4) if rest & (1 << j)])
+        return tours
+
 
 def cornersHeuristic(state, problem):
     """
@@ -390,58 +509,15 @@ def cornersHeuristic(state, problem):
     # Walls is a given condition, but it is probably useless here.
     walls = problem.walls # These are the walls of the maze, as a Grid (game.py)
     "*** YOUR CODE HERE ***"
-    from util import manhattanDistance
-
-    # Need find (1) the distance between the pacman and the closest corner to it (0 at last),
-    #           (2) the distance to other corners from the closest corner (0 when one/none corner left to explore).
-    #
-    # Tried to use mazeDistance() in this function, but it does not work, because we don't have the attribute
-    # self.gameState.
-
-    position = state[0]
-    remain_corners = [corner for corner in state[1]]
 
-    # Case 1: if there is not any corner left to explore, then the pacman must be standing on the last explored corner.
-    if len(remain_corners) == 0:
+    # The maze distance to the first corner plus the shortest tour from it through the other remaining corners,
+    # both precomputed in CornersProblem.__init__.  Every path through the corners is such a walk, so this is the
+    # exact remaining cost: admissible, consistent and a few list lookups.
+    cell, mask = state
+    if mask == 0:
         return 0
-
-    # Case 2: only 1 corner left to explore.
-    if len(remain_corners) == 1:
-        return manhattanDistance(remain_corners[0], position)
-
-    # Case 3: at least 2 corners to explore.
-    elif len(remain_corners) > 1:
-        ### (1) ###
-        closest_corner_index = 0
-        closest_corner_dis = manhattanDistance(remain_corners[0], position)
-        for i in range(1, len(remain_corners)):
-
-            if manhattanDistance(remain_corners[i], position) < closest_corner_dis:
-                closest_corner_dis = manhattanDistance(remain_corners[i], position)
-                closest_corner_index = i
-
-        ### (2) ###
-        # Move to the closest corner.
-        corners_heuristic_dis = 0
-        curr_position = remain_corners[closest_corner_index]
-
-        # A simplified Kruskal-minimum-spanning-tree-algorithm. Thanks to CSC373.
-        remain_corners.pop(closest_corner_index)
-        while not len(remain_corners) == 0:
-
-            # Find all distances between other corners and the current corner.
-            dis_lst = [manhattanDistance(curr_position, corner) for corner in remain_corners]
-
-            # Move the next closest corner.
-            next_min_dis = min(dis_lst)
-            next_min_dis_index = dis_lst.index(next_min_dis)
-            curr_position = remain_corners[next_min_dis_index]
-            remain_corners.pop(next_min_dis_index)
-
-            # Update the estimated distance.
-            corners_heuristic_dis += next_min_dis
-
-        return closest_corner_dis + corners_heuristic_dis
+    distances, tours = problem.cornerDistances, problem.cornerTours[mask]
+    return min([distances[i][cell] + tours[i] for i in range(4) if mask & (1 << i)])
 
 
 class AStarCornersAgent(SearchAgent):
@@ -456,12 +532,20 @@ class FoodSearchProblem:
     A search problem associated with finding the a path that collects all of the
     food (dots) in a Pacman game.
 
-    A search state in this problem is a tuple ( pacmanPosition, foodGrid ) where
+    A search state in this problem is a tuple ( pacmanPosition, foodMask ) where
       pacmanPosition: a tuple (x,y) of integers specifying Pacman's position
-      foodGrid:       a Grid (see game.py) of either True or False, specifying remaining food
+      foodMask:       an int whose bit i is set while the food at
+                      problem.foodPositions[i] has not been eaten yet
+
+    The food is numbered in the order of startingGameState.getFood().asList().
+    Use getFoodGrid / getFoodMask to convert between masks and Grids (see
+    game.py), or getFoodPositions to list the remaining food coordinates.
     """
     def __init__(self, startingGameState):
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
+        food = startingGameState.getFood()
+        self.foodPositions = food.asList()
+        self.foodIndex = dict((position, i) for i, position in enumerate(self.foodPositions))
+        self.start = (startingGameState.getPacmanPosition(), self.getFoodMask(food))
         self.walls = startingGameState.getWalls()
         self.startingGameState = startingGameState
         self._expanded = 0 # DO NOT CHANGE
@@ -471,7 +555,7 @@ class FoodSearchProblem:
         return self.start
 
     def isGoalState(self, state):
-        return state[1].count() == 0
+        return state[1] == 0
 
     def getSuccessors(self, state):
         "Returns successor states, the actions they require, and a cost of 1."
@@ -482,11 +566,35 @@ class FoodSearchProblem:
             dx, dy = Actions.directionToVector(direction)
             nextx, nexty = int(x + dx), int(y + dy)
             if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
+                nextFood = state[1]
+                if (nextx, nexty) in self.foodIndex:
+                    nextFood &= ~(1 << self.foodIndex[(nextx, nexty)])
                 successors.append( ( ((nextx, nexty), nextFood), direction, 1) )
         return successors
 
+    def getFoodMask(self, foodGrid):
+        "Returns the food mask of a Grid of food, which may only hold food from the start state"
+        mask = 0
+        for position in foodGrid.asList():
+            mask |= 1 << self.foodIndex[position]
+        return mask
+
+    def getFoodGrid(self, foodMask):
+        "Returns a Grid (see game.py) of the food remaining in foodMask"
+        grid = Grid(self.walls.width, self.walls.height)
+        for x, y in self.getFoodPositions(foodMask):
+            grid[x][y] = True
+        return grid
+
+    def getFoodPositions(self, foodMask):
+        "Returns the list of (x,y) coordinates of the food remaining in foodMask"
+        positions = []
+        while foodMask:
+            lowest = foodMask & -foodMask
+            positions.append(self.foodPositions[lowest.bit_length() - 1])
+            foodMask ^= lowest
+        return positions
+
     def getCostOfActions(self, actions):
         """Returns the cost of a particular sequence of actions.  If those actions
         include an illegal move, return 999999"""
@@ -503,12 +611,31 @@ class FoodSearchProblem:
 
 
 class AStarFoodSearchAgent(SearchAgent):
-    "A SearchAgent for FoodSearchProblem using A* and your foodHeuristic"
-    def __init__(self):
-        self.searchFunction = lambda prob: search.aStarSearch(prob, foodHeuristic)
+    """
+    A SearchAgent for FoodSearchProblem using A* and your foodHeuristic
+
+    With at most maxFood food, the exact Held-Karp solver of foodTourSearch
+    is used instead; maxFood=0 always runs A*.
+    """
+    def __init__(self, maxFood=14):
+        maxFood = int(maxFood)
+        self.searchFunction = lambda prob: foodTourSearch(prob, maxFood)
         self.searchType = FoodSearchProblem
 
 
+def foodTourSearch(problem, maxFood=14):
+    """
+    Solves a FoodSearchProblem with at most maxFood food exactly, as the
+    shortest path from Pacman through every food (see foodTour.py), and
+    falls back to A* with foodHeuristic on larger problems.
+    """
+    position, foodMask = problem.getStartState()
+    remain_foods = problem.getFoodPositions(foodMask)
+    if len(remain_foods) > maxFood:
+        return search.aStarSearch(problem, foodHeuristic)
+    return foodTour.findFoodPath(problem.startingGameState.data.layout, position, remain_foods)
+
+
 def foodHeuristic(state, problem):
     """Your heuristic for the FoodSearchProblem goes here.
 
@@ -519,9 +646,10 @@ def foodHeuristic(state, problem):
     hand, inadmissible heuristics may occasionally find optimal
     solutions, so be careful.
 
-    The state is a tuple ( pacmanPosition, foodGrid ) where foodGrid is a Grid
-    (see game.py) of either True or False. You can call foodGrid.asList() to get
-    a list of food coordinates instead.
+    The state is a tuple ( pacmanPosition, foodMask ) where foodMask is an int
+    with one bit per remaining food (see FoodSearchProblem). You can call
+    problem.getFoodPositions(foodMask) to get a list of food coordinates, or
+    problem.getFoodGrid(foodMask) to get a Grid (see game.py) of the food.
 
     If you want access to info like walls, capsules, etc., you can query the
     problem.  For example, problem.walls gives you a Grid of where the walls
@@ -535,47 +663,67 @@ def foodHeuristic(state, problem):
     problem.heuristicInfo['wallCount']
 
     """
-    position, foodGrid = state
+    position, foodMask = state
     "*** YOUR CODE HERE ***"
 
-    # The codes in the below comment were based on my previous idea: calculate the minimum distance to connect all
-    # remaining foods, i.e. computing the minimum-spanning-tree, but it was inadmissible. The logic should be right, but
-    # it is not working in reality.
-    # Then I switched to another idea: calculate only the farthest node.
-
-    remain_foods = foodGrid.asList()
-    foods_dis = [mazeDistance(position, food_position, problem.startingGameState) for food_position in remain_foods]
+    # The maze distance to the closest food plus the weight of a minimum spanning tree over the remaining foods.
+    # Any path that eats every food first walks to some food (at least the closest one), then links all of the
+    # foods together (at least the MST), so it is admissible. My first MST attempt was inadmissible because it
+    # started the tree at the pacman; here the pacman is only joined through its closest food.
 
-    # The pacman ate the final food.
-    if len(foods_dis) == 0:
+    if foodMask == 0:
         return 0
 
-    # Else, there is at least one node left.
-    return max(foods_dis)
-
-    # Previous idea:
-    #
-    # foods_heuristic_dis = 0
-    #
-    # if len(food_dis) == 0:
-    #     return foods_heuristic_dis
-    #
-    # while not len(remain_foods) == 0:
-    #
-    #     foods_dis = [mazeDistance(position, food_position, problem.startingGameState) for food_position in remain_foods]
-    #
-    #     closest_food_dis = min(foods_dis)
-    #     closest_food_index = foods_dis.index(closest_food_dis)
-    #     position = remain_foods[closest_food_index]
-    #     remain_foods.pop(closest_food_index)
-    #
-    #     foods_heuristic_dis += closest_food_dis
-    #
-    # return foods_heuristic_dis
+    info = problem.heuristicInfo
+    if 'distances' not in info:
+        # Built once per problem: the all-pairs maze table of the layout and the food-to-food distance matrix.
+        table = mazeDistances.getMazeDistances(problem.startingGameState.data.layout)
+        info['table'] = table
+        info['foodCells'] = [table.cellIndex[food_position] for food_position in problem.foodPositions]
+        info['distances'] = [[table.getDistanceByIndex(i, j) for j in info['foodCells']] for i in info['foodCells']]
+        info['mst'] = {}
+
+    remain_foods = [i for i in range(len(problem.foodPositions)) if foodMask & (1 << i)]
+    table, foodCells = info['table'], info['foodCells']
+    cell = table.cellIndex[position]
+    food_distances = [table.getDistanceByIndex(cell, foodCells[i]) for i in remain_foods]
+    if mazeDistances.UNREACHABLE in food_distances:
+        # Some food cannot be reached from here, so no plan from this state eats it all.
+        return float('inf')
+    closest_food_dis = min(food_distances)
+
+    # The MST only depends on which foods remain, so it is shared by every state with the same mask.
+    if foodMask not in info['mst']:
+        info['mst'][foodMask] = _spanningTreeWeight(remain_foods, info['distances'])
+    return closest_food_dis + info['mst'][foodMask]
+
+
+def _spanningTreeWeight(nodes, distances):
+    "Prim's algorithm on the complete graph over nodes, with edge weights distances[i][j]"
+    closest = dict((node, distances[nodes[0]][node]) for node in nodes[1:])
+    weight = 0
+    while closest:
+        node = min(closest, key=closest.get)
+        weight += closest.pop(node)
+        for other in closest:
+            if distances[node][other] < closest[other]:
+                closest[other] = distances[node][other]
+    return weight
 
 
 class ClosestDotSearchAgent(SearchAgent):
-    "Search for all food using a sequence of searches"
+    """
+    Search for all food using a sequence of searches.
+
+    Each closest dot is read off a FoodDistanceField (see foodDistances.py)
+    kept up to date as food is eaten; planner=dstar uses a D* Lite planner
+    (see dstarLite.py) instead.
+    """
+    def __init__(self, planner='field'):
+        if planner not in ['field', 'dstar']:
+            raise AttributeError, planner + ' is not a closest dot planner (field or dstar).'
+        self.plannerName = planner
+
     def registerInitialState(self, state):
         self.actions = []
         currentState = state
@@ -600,14 +748,24 @@ class ClosestDotSearchAgent(SearchAgent):
         startPosition = gameState.getPacmanPosition()
         food = gameState.getFood()
         walls = gameState.getWalls()
-        problem = AnyFoodSearchProblem(gameState)
 
         "*** YOUR CODE HERE ***"
 
-        # dfs doesn't work here.
-        # bfs, ucs, astar works. This is a greedy algorithm, so it does not matter which algorithm I choose, but bfs
-        # and ucs might require more spaces than astar does.
-        return search.astar(problem)
+        # Instead of a fresh search on an AnyFoodSearchProblem per dot, one distance field or D* Lite planner is
+        # kept between calls and only repairs the cells affected by the eaten food (and Pacman's move).
+        if 'plannerName' not in dir(self) or self.plannerName == 'field':
+            if 'foodField' not in dir(self) or self.foodField.walls != walls:
+                self.foodField = foodDistances.FoodDistanceField(walls, food.asList())
+            else:
+                self.foodField.updateFood(food.asList())
+            return self.foodField.getPath(startPosition)
+
+        if 'planner' not in dir(self) or self.planner.walls != walls:
+            self.planner = dstarLite.ClosestDotPlanner(walls, food.asList(), startPosition)
+        else:
+            self.planner.updateGoals(food.asList())
+            self.planner.moveStart(startPosition)
+        return self.planner.findPath()
 
 
 class AnyFoodSearchProblem(PositionSearchProblem):
@@ -647,14 +805,16 @@ class AnyFoodSearchProblem(PositionSearchProblem):
 
         # My previous idea was wrong, I was trying to find all foods.
         # We only care if the pacman finds the next food, but not all foods.
-        return (x, y) in self.food.asList()
+        # Index the food Grid directly: food.asList() would scan the whole board on every goal test.
+        return self.food[x][y]
 
 
 def mazeDistance(point1, point2, gameState):
     """
     Returns the maze distance between any two points, using the search functions
     you have already built. The gameState can be any game state -- Pacman's
-    position in that state is ignored.
+    position in that state is ignored.  Raises an exception if there is no
+    path between the points.
 
     Example usage: mazeDistance( (2,4), (5,6), gameState)
 
@@ -665,5 +825,11 @@ def mazeDistance(point1, point2, gameState):
     walls = gameState.getWalls()
     assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
-    prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return len(search.bfs(prob))
+
+    # Looked up in the all-pairs table built once per layout (see mazeDistances.py) instead of running a BFS on
+    # every call.  The table stores UNREACHABLE for cells with no path between them, which must not pass for a
+    # distance.
+    distance = mazeDistances.getMazeDistances(gameState.data.layout).getDistance(point1, point2)
+    if distance == mazeDistances.UNREACHABLE:
+        raise Exception('No path from %s to %s' % (str(point1), str(point2)))
+    return distance
@@ -252,6 +252,49 @@ class GraphSearchTest(testClasses.TestCase):
 
 
 
+class SuboptimalityBoundTest(testClasses.TestCase):
+
+    # Runs anytimeAStarSearch on a graph and checks that the suboptimality bound it
+    # reports is no smaller than the true ratio of its plan's cost to the optimal cost.
+    def __init__(self, question, testDict):
+        super(SuboptimalityBoundTest, self).__init__(question, testDict)
+        self.graph_text = testDict['graph']
+        self.diagram = testDict['diagram']
+        self.heuristic = parseHeuristic(testDict['heuristic'])
+        self.timeLimit = float(testDict['timeLimit'])
+
+    def execute(self, grades, moduleDict, solutionDict):
+        search = moduleDict['search']
+        optimalCost = float(solutionDict['optimal_cost'])
+        problem = GraphSearch(self.graph_text)
+        solution = search.anytimeAStarSearch(problem, self.heuristic, timeLimit=self.timeLimit)
+        cost = problem.getCostOfActions(solution)
+        bound = problem._suboptimalityBound
+
+        if cost <= bound * optimalCost:
+            grades.addMessage('PASS: %s' % self.path)
+            grades.addMessage('\tsolution cost %s, reported bound %s' % (cost, bound))
+            return True
+        grades.addMessage('FAIL: %s' % self.path)
+        grades.addMessage('\tgraph:')
+        for line in self.diagram.split('\n'):
+            grades.addMessage('\t    %s' % (line,))
+        grades.addMessage('\tsolution cost %s is more than the reported bound %s times the optimal cost %s'
+                          % (cost, bound, optimalCost))
+        return False
+
+    def writeSolution(self, moduleDict, filePath):
+        search = moduleDict['search']
+        problem = GraphSearch(self.graph_text)
+        cost = problem.getCostOfActions(search.ucs(problem))
+        handle = open(filePath, 'w')
+        handle.write('# This is the solution file for %s.\n' % self.path)
+        handle.write('optimal_cost: "%s"\n' % cost)
+        handle.close()
+        return True
+
+
+
 class PacmanSearchTest(testClasses.TestCase):
 
     def __init__(self, question, testDict):
@@ -0,0 +1,68 @@
+# tableCache.py
+# -------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Saves precomputed tables (arrays of numbers) on disk so that later runs only
+read them back, as used by mazeDistances.py and patternDatabase.py.
+
+Failures are never fatal: a table that cannot be read is built again and one
+that cannot be written is simply not cached.
+
+> table = loadTable(CACHE_DIRECTORY, 'name.dist', 'H', expectedLength)
+> if table is None: saveTable(CACHE_DIRECTORY, 'name.dist', buildTable())
+"""
+
+import array
+import os
+
+
+def loadTable(directory, name, typecode, length):
+    """
+    Returns the array of the given typecode saved as name in directory, or
+    None if directory is None or there is no readable table of that length.
+    """
+    if directory is None:
+        return None
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        return None
+    table = array.array(typecode)
+    try:
+        f = open(path, 'rb')
+        try: table.fromstring(f.read())
+        finally: f.close()
+    except (IOError, ValueError):
+        return None
+    # A truncated or stale file is simply rebuilt.
+    if len(table) != length:
+        return None
+    return table
+
+
+def saveTable(directory, name, table):
+    "Saves an array as name in directory, unless directory is None"
+    if directory is None:
+        return
+    path = os.path.join(directory, name)
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        # Write to a temporary name first so a concurrent run never reads half a table.
+        temporary = path + '.%d.tmp' % os.getpid()
+        f = open(temporary, 'wb')
+        try: f.write(table.tostring())
+        finally: f.close()
+        os.rename(temporary, path)
+    except (IOError, OSError):
+        pass
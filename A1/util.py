@@ -29,6 +29,7 @@
 import sys
 import inspect
 import heapq, random
+import collections
 import cStringIO
 
 
@@ -206,6 +207,194 @@ class PriorityQueue:
         else:
             self.push(item, priority)
 
+class IndexedPriorityQueue:
+    """
+      A priority queue that holds at most one entry per item.  A position map
+      from each item to its slot in the binary heap lets update() change the
+      priority of a queued item in O(log n), instead of the linear scan and
+      full heapify done by PriorityQueue.update.  Items must be hashable.
+      Items with equal priority are popped in the order they were pushed.
+    """
+    def  __init__(self):
+        self.heap = []
+        self.positions = {}
+        self.count = 0
+
+    def push(self, item, priority):
+        "Adds 'item', or moves it to 'priority' if it is already queued"
+        if item in self.positions:
+            self._move(self.positions[item], priority)
+            return
+        self.heap.append([priority, self.count, item])
+        self.positions[item] = len(self.heap) - 1
+        self.count += 1
+        self._siftUp(len(self.heap) - 1)
+
+    def pop(self):
+        "Removes and returns the item with the lowest priority"
+        last = self.heap.pop()
+        if self.heap:
+            item = self.heap[0][2]
+            self.heap[0] = last
+            self.positions[last[2]] = 0
+            self._siftDown(0)
+        else:
+            item = last[2]
+        del self.positions[item]
+        return item
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def update(self, item, priority):
+        # Same contract as PriorityQueue.update: lower the priority of a queued item (decrease-key), ignore a higher
+        # or equal priority, and push the item if it is not queued yet.
+        if item not in self.positions:
+            self.push(item, priority)
+        elif priority < self.heap[self.positions[item]][0]:
+            self._move(self.positions[item], priority)
+
+    def getPriority(self, item):
+        return self.heap[self.positions[item]][0]
+
+    def remove(self, item):
+        "Removes a queued 'item' from the queue"
+        index = self.positions.pop(item)
+        last = self.heap.pop()
+        if index < len(self.heap):
+            self.heap[index] = last
+            self.positions[last[2]] = index
+            self._siftUp(index)
+            self._siftDown(self.positions[last[2]])
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _move(self, index, priority):
+        old = self.heap[index][0]
+        self.heap[index][0] = priority
+        if priority < old:
+            self._siftUp(index)
+        else:
+            self._siftDown(index)
+
+    def _swap(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.positions[heap[i][2]] = i
+        self.positions[heap[j][2]] = j
+
+    def _less(self, i, j):
+        # Compare (priority, count) only, so the items themselves never need to be comparable.
+        a, b = self.heap[i], self.heap[j]
+        return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
+
+    def _siftUp(self, index):
+        while index > 0:
+            parent = (index - 1) >> 1
+            if self._less(index, parent):
+                self._swap(index, parent)
+                index = parent
+            else:
+                break
+
+    def _siftDown(self, index):
+        size = len(self.heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self._less(child, smallest):
+                    smallest = child
+            if smallest == index:
+                break
+            self._swap(index, smallest)
+            index = smallest
+
+class BucketPriorityQueue:
+    """
+      Dial's bucket queue: one FIFO bucket per integer priority and a
+      pointer to the lowest non-empty bucket, so push and pop cost O(1)
+      instead of O(log n) when priorities are non-negative integers close to
+      each other, like path costs in grids with unit step costs.
+
+      Buckets are kept in a dict by priority and dropped once empty, so
+      memory follows the number of distinct priorities queued, not their
+      size.  The first priority that does not fit (a fraction, infinity,
+      NaN, a negative number, or one more than maxSpread away from another
+      queued priority, which would make pop walk a long run of empty
+      buckets) moves every queued item into a PriorityQueue, which serves
+      all later calls.  Items with equal priority are popped in the order
+      they were pushed either way, so switching never changes the order in
+      which items come out.
+    """
+    def  __init__(self, maxSpread=1024):
+        self.maxSpread = maxSpread
+        self.buckets = {}
+        self.current = 0
+        self.highest = 0
+        self.size = 0
+        self.fallback = None
+
+    def push(self, item, priority):
+        if self.fallback is None:
+            # Check for a finite whole number before int(), which fails on the infinite and NaN priorities a heap takes.
+            if isinstance(priority, (int, long)):
+                bucket = priority
+            elif priority == priority and abs(priority) != float('inf') and priority == int(priority):
+                bucket = int(priority)
+            else:
+                bucket = -1
+            if self.size == 0:
+                self.current = self.highest = bucket
+            lowest, highest = min(self.current, bucket), max(self.highest, bucket)
+            if lowest >= 0 and highest - lowest <= self.maxSpread:
+                if bucket in self.buckets:
+                    self.buckets[bucket].append(item)
+                else:
+                    self.buckets[bucket] = collections.deque([item])
+                self.current, self.highest = lowest, highest
+                self.size += 1
+                return
+            self._switchToHeap()
+        self.fallback.push(item, priority)
+
+    def pop(self):
+        if self.fallback is not None:
+            return self.fallback.pop()
+        buckets = self.buckets
+        while self.current not in buckets:
+            self.current += 1
+        bucket = buckets[self.current]
+        item = bucket.popleft()
+        if not bucket:
+            del buckets[self.current]
+        self.size -= 1
+        return item
+
+    def isEmpty(self):
+        if self.fallback is not None:
+            return self.fallback.isEmpty()
+        return self.size == 0
+
+    def usesBuckets(self):
+        "Returns True until the queue had to switch to a binary heap"
+        return self.fallback is None
+
+    def __len__(self):
+        if self.fallback is not None:
+            return len(self.fallback.heap)
+        return self.size
+
+    def _switchToHeap(self):
+        self.fallback = PriorityQueue()
+        for priority in sorted(self.buckets):
+            for item in self.buckets[priority]:
+                self.fallback.push(item, priority)
+        self.buckets = {}
+
 class PriorityQueueWithFunction(PriorityQueue):
     """
     Implements a priority queue with the same push/pop signature of the
@@ -0,0 +1,125 @@
+# wavefront.py
+# ------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Breadth first search on a walls Grid, one whole frontier at a time.
+
+Instead of popping cells one by one, every step shifts the boolean frontier
+array by one cell in each of the four directions and masks it with the open
+cells, so a maze is flooded in as many NumPy operations as its diameter.
+Only unit step costs are supported.  NumPy is optional for the rest of the
+project; it is only needed when these functions are called.
+
+> field = distanceField(walls, food.asList())    # multi-source
+> path = findPath(walls, start, [goal])          # single target
+"""
+
+from game import Actions
+from game import Directions
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Distance stored in a field for cells the wavefront never reached.
+UNREACHED = -1
+
+
+def _requireNumpy():
+    if numpy is None:
+        raise Exception('wavefront.py needs NumPy, which is not installed')
+
+
+def openCells(walls):
+    "Returns a (width, height) boolean array, indexed [x, y], of the cells that are not walls"
+    _requireNumpy()
+    return ~numpy.array(walls.data, dtype=bool)
+
+
+def distanceField(walls, sources, stopAt=None):
+    """
+    Returns a (width, height) int array of the maze distance from every cell
+    to the nearest of the given source positions, UNREACHED for walls and
+    cells that cannot be reached.
+
+    If stopAt is a list of positions, flooding stops as soon as one of them
+    is reached; cells farther away are then left UNREACHED.
+    """
+    isOpen = openCells(walls)
+    field = numpy.empty(isOpen.shape, dtype=numpy.int32)
+    field.fill(UNREACHED)
+
+    frontier = numpy.zeros(isOpen.shape, dtype=bool)
+    for x, y in sources:
+        frontier[x, y] = True
+    frontier &= isOpen
+    reached = frontier.copy()
+
+    stop = None
+    if stopAt is not None:
+        stop = numpy.zeros(isOpen.shape, dtype=bool)
+        for x, y in stopAt:
+            stop[x, y] = True
+
+    distance = 0
+    while frontier.any():
+        field[frontier] = distance
+        if stop is not None and (frontier & stop).any():
+            break
+        grown = numpy.zeros(isOpen.shape, dtype=bool)
+        grown[1:, :] |= frontier[:-1, :]
+        grown[:-1, :] |= frontier[1:, :]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & isOpen & ~reached
+        reached |= frontier
+        distance += 1
+    return field
+
+
+def pathDownhill(field, start):
+    """
+    Returns the actions that lead from start to a source of the field by
+    always stepping to a neighbour one step closer, or None if start was not
+    reached.  Neighbours are tried in the order North, South, East, West.
+    """
+    x, y = start
+    if field[x, y] == UNREACHED:
+        return None
+    width, height = field.shape
+    path = []
+    while field[x, y] > 0:
+        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+            dx, dy = Actions.directionToVector(action)
+            nextx, nexty = int(x + dx), int(y + dy)
+            if 0 <= nextx < width and 0 <= nexty < height and field[nextx, nexty] == field[x, y] - 1:
+                path.append(action)
+                x, y = nextx, nexty
+                break
+    return path
+
+
+def findPath(walls, start, targets):
+    """
+    Returns a shortest list of actions from start to the nearest of targets,
+    or None if none of them can be reached.  The field is flooded from the
+    targets and stops as soon as it reaches start.
+    """
+    return pathDownhill(distanceField(walls, targets, stopAt=[start]), start)
+
+
+def reachedCount(field):
+    "Returns the number of cells the wavefront reached"
+    return int((field != UNREACHED).sum())
@@ -21,7 +21,7 @@
 # For more info, see http://inst.eecs.berkeley.edu/~cs188/sp09/pacman.html
 
 from util import *
-import time, os
+import time, os, random
 import traceback
 import sys
 
@@ -159,12 +159,18 @@ class AgentState:
     def getDirection(self):
         return self.configuration.getDirection()
 
-class Grid:
+class Grid(object):
     """
-    A 2-dimensional array of objects backed by a list of lists.  Data is accessed
+    A 2-dimensional array of booleans backed by a single int.  Data is accessed
     via grid[x][y] where (x,y) are positions on a Pacman map with x horizontal,
     y vertical and the origin (0,0) in the bottom left corner.
 
+    Cell (x,y) is bit x * height + y of 'bits', the same column by column order
+    used by packBits, and the number of True cells is kept up to date as cells
+    are set.  So count() is O(1), and copy() and hashing only copy or hash one
+    int instead of visiting every cell.  Only booleans can be stored: setting a
+    cell to anything else raises an exception.
+
     The __str__ method constructs an output that is oriented like a pacman board.
     """
     def __init__(self, width, height, initialValue=False, bitRepresentation=None):
@@ -173,57 +179,73 @@ class Grid:
 
         self.width = width
         self.height = height
-        self.data = [[initialValue for y in range(height)] for x in range(width)]
+        self.bits = 0
+        self.numTrue = 0
+        if initialValue:
+            self.bits = (1 << (width * height)) - 1
+            self.numTrue = width * height
+        self._columns = None
         if bitRepresentation:
             self._unpackBits(bitRepresentation)
 
     def __getitem__(self, i):
-        return self.data[i]
+        # Column views are made once per grid, on first access, so that copies stay O(1).
+        if self._columns is None:
+            self._columns = [_GridColumn(self, x) for x in range(self.width)]
+        return self._columns[i]
 
     def __setitem__(self, key, item):
-        self.data[key] = item
+        column = self[key]
+        for y, value in enumerate(item):
+            column[y] = value
+
+    def getData(self):
+        "Returns the cells as a list of columns, like grid.data in the list-backed Grid"
+        return [list(self[x]) for x in range(self.width)]
+    data = property(getData)
 
     def __str__(self):
-        out = [[str(self.data[x][y])[0] for x in range(self.width)] for y in range(self.height)]
+        out = [[str(self[x][y])[0] for x in range(self.width)] for y in range(self.height)]
         out.reverse()
         return '\n'.join([''.join(x) for x in out])
 
     def __eq__(self, other):
-        if other == None: return False
-        return self.data == other.data
+        if not isinstance(other, Grid): return False
+        return self.bits == other.bits and self.width == other.width and self.height == other.height
+
+    def __ne__(self, other):
+        return not self == other
 
     def __hash__(self):
-        # return hash(str(self))
-        base = 1
-        h = 0
-        for l in self.data:
-            for i in l:
-                if i:
-                    h += base
-                base *= 2
-        return hash(h)
+        return hash(self.bits)
 
     def copy(self):
         g = Grid(self.width, self.height)
-        g.data = [x[:] for x in self.data]
+        g.bits = self.bits
+        g.numTrue = self.numTrue
         return g
 
     def deepCopy(self):
         return self.copy()
 
     def shallowCopy(self):
-        g = Grid(self.width, self.height)
-        g.data = self.data
-        return g
+        # Ints are immutable, so a copy shares as much as the old shared list of lists did.
+        return self.copy()
 
     def count(self, item =True ):
-        return sum([x.count(item) for x in self.data])
+        if item:
+            return self.numTrue
+        return self.width * self.height - self.numTrue
 
     def asList(self, key = True):
+        bits = self.bits
+        if not key:
+            bits ^= (1 << (self.width * self.height)) - 1
         list = []
-        for x in range(self.width):
-            for y in range(self.height):
-                if self[x][y] == key: list.append( (x,y) )
+        while bits:
+            lowest = bits & -bits
+            list.append(self._cellIndexToPosition(lowest.bit_length() - 1))
+            bits ^= lowest
         return list
 
     def packBits(self):
@@ -236,8 +258,7 @@ class Grid:
         currentInt = 0
         for i in range(self.height * self.width):
             bit = self.CELLS_PER_INT - (i % self.CELLS_PER_INT) - 1
-            x, y = self._cellIndexToPosition(i)
-            if self[x][y]:
+            if (self.bits >> i) & 1:
                 currentInt += 2 ** bit
             if (i + 1) % self.CELLS_PER_INT == 0:
                 bits.append(currentInt)
@@ -274,6 +295,61 @@ class Grid:
                 bools.append(False)
         return bools
 
+class _GridColumn(object):
+    """
+    The column grid[x] of a Grid: reads and writes its cells as grid[x][y].
+    """
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.height = grid.height
+        self.offset = x * grid.height
+
+    def __getitem__(self, y):
+        # This is the hot path of every wall and food test, so the common case is checked first.
+        if 0 <= y < self.height:
+            return (self.grid.bits >> (self.offset + y)) & 1 == 1
+        if -self.height <= y < 0:
+            return self[y + self.height]
+        if isinstance(y, slice):
+            return list(self)[y]
+        raise IndexError('Grid index out of range')
+
+    def __setitem__(self, y, value):
+        if isinstance(y, slice):
+            cells = range(*y.indices(self.height))
+            values = list(value)
+            if len(values) != len(cells): raise ValueError('Grid columns cannot change length')
+            for y, value in zip(cells, values):
+                self[y] = value
+            return
+        if value not in [False, True]: raise Exception('Grids can only contain booleans')
+        if y < 0: y += self.height
+        if not 0 <= y < self.height: raise IndexError('Grid index out of range')
+        grid, bit = self.grid, 1 << (self.offset + y)
+        if value and not grid.bits & bit:
+            grid.bits |= bit
+            grid.numTrue += 1
+        elif not value and grid.bits & bit:
+            grid.bits ^= bit
+            grid.numTrue -= 1
+
+    def __len__(self):
+        return self.height
+
+    def __iter__(self):
+        bits = self.grid.bits >> self.offset
+        for y in range(self.height):
+            yield (bits >> y) & 1 == 1
+
+    def count(self, item=True):
+        return list(self).count(item)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
 def reconstituteGrid(bitRep):
     if type(bitRep) is not type((1,2)):
         return bitRep
@@ -368,6 +444,20 @@ class Actions:
         return (x + dx, y + dy)
     getSuccessor = staticmethod(getSuccessor)
 
+# Zobrist keys: a random number for each feature a game state can have (an agent's configuration and scared timer,
+# a food, a capsule).  The key of a state is the XOR of the keys of its features, so a move updates it by XORing out
+# the features it removes and in those it adds.  Keys are drawn on first use from a generator of their own, so they
+# never disturb the global random state that games and autograders seed.
+_ZOBRIST_RANDOM = random.Random(1048575)
+_ZOBRIST_KEYS = {}
+
+def zobristKey( feature ):
+    "Returns the random 63-bit key of a hashable feature, the same one every time"
+    key = _ZOBRIST_KEYS.get(feature)
+    if key is None:
+        key = _ZOBRIST_KEYS[feature] = _ZOBRIST_RANDOM.getrandbits(63)
+    return key
+
 class GameStateData:
     """
 
@@ -375,14 +465,24 @@ class GameStateData:
     def __init__( self, prevState = None ):
         """
         Generates a new data packet by copying information from its predecessor.
+
+        The copy is copy on write: the food grid, the capsule list and the
+        AgentStates stay shared with prevState, and the game rules replace
+        them before changing them (see agentStateForUpdate).  Use deepCopy
+        for a copy that may be changed freely.
         """
         if prevState != None:
-            self.food = prevState.food.shallowCopy()
-            self.capsules = prevState.capsules[:]
-            self.agentStates = self.copyAgentStates( prevState.agentStates )
+            self.food = prevState.food
+            self.capsules = prevState.capsules
+            self.agentStates = prevState.agentStates[:]
             self.layout = prevState.layout
             self._eaten = prevState._eaten
             self.score = prevState.score
+            self._zobrist = prevState._zobrist
+            self._sharedAgentStates = prevState.agentStates
+        else:
+            self._zobrist = None
+            self._sharedAgentStates = None
 
         self._foodEaten = None
         self._foodAdded = None
@@ -395,13 +495,27 @@ class GameStateData:
     def deepCopy( self ):
         state = GameStateData( self )
         state.food = self.food.deepCopy()
-        state.layout = self.layout.deepCopy()
+        state.capsules = self.capsules[:]
+        state.agentStates = self.copyAgentStates( self.agentStates )
+        state._sharedAgentStates = None
+        state.layout = self.layout # Shared: layouts never change (see layout.py)
         state._agentMoved = self._agentMoved
         state._foodEaten = self._foodEaten
         state._foodAdded = self._foodAdded
         state._capsuleEaten = self._capsuleEaten
         return state
 
+    def agentStateForUpdate( self, index ):
+        """
+        Returns agentStates[index] to be changed in place.  The first call for
+        an agent still shared with the state this one was copied from
+        replaces it by a copy of its own.
+        """
+        agentState = self.agentStates[index]
+        if self._sharedAgentStates is not None and agentState is self._sharedAgentStates[index]:
+            agentState = self.agentStates[index] = agentState.copy()
+        return agentState
+
     def copyAgentStates( self, agentStates ):
         copiedStates = []
         for agentState in agentStates:
@@ -422,19 +536,55 @@ class GameStateData:
 
     def __hash__( self ):
         """
-        Allows states to be keys of dictionaries.
+        Allows states to be keys of dictionaries.  Equal states have equal
+        Zobrist keys, and successors keep theirs up to date (see
+        updateZobristKey), so this is O(1) however large the board.
+        """
+        if self._zobrist is None:
+            self._zobrist = self.computeZobristKey()
+        return self._zobrist ^ hash(self.score)
+
+    def computeZobristKey( self ):
+        "Computes the Zobrist key of the agents, food and capsules from scratch"
+        key = 0
+        for index, agentState in enumerate( self.agentStates ):
+            key ^= self._agentKey( index, agentState )
+        for pos in self.food.asList():
+            key ^= zobristKey( ('food', pos) )
+        for pos in self.capsules:
+            key ^= zobristKey( ('capsule', pos) )
+        return key
+
+    def updateZobristKey( self, prevState ):
         """
-        for i, state in enumerate( self.agentStates ):
-            try:
-                int(hash(state))
-            except TypeError, e:
-                print e
-                #hash(state)
-        return int((hash(tuple(self.agentStates)) + 13*hash(self.food) + 113* hash(tuple(self.capsules)) + 7 * hash(self.score)) % 1048575 )
+        Derives the Zobrist key from that of prevState, the data this was
+        copied from before one move was applied to it: only the agents that
+        changed and the food or capsule eaten are XORed.
+        """
+        if prevState._zobrist is None:
+            self._zobrist = None
+            return
+        key = prevState._zobrist
+        for index, agentState in enumerate( self.agentStates ):
+            prevAgentState = prevState.agentStates[index]
+            if agentState is not prevAgentState and agentState != prevAgentState:
+                key ^= self._agentKey( index, prevAgentState ) ^ self._agentKey( index, agentState )
+        if self._foodEaten != None:
+            key ^= zobristKey( ('food', self._foodEaten) )
+        if self._foodAdded != None:
+            key ^= zobristKey( ('food', self._foodAdded) )
+        if self._capsuleEaten != None:
+            key ^= zobristKey( ('capsule', self._capsuleEaten) )
+        self._zobrist = key
+
+    def _agentKey( self, index, agentState ):
+        conf = agentState.configuration
+        return zobristKey( (index, conf.pos, conf.direction, agentState.scaredTimer) )
 
     def __str__( self ):
         width, height = self.layout.width, self.layout.height
-        map = Grid(width, height)
+        # A list of columns of characters: Grids only hold booleans.
+        map = [[' '] * height for x in range(width)]
         if type(self.food) == type((1,2)):
             self.food = reconstituteGrid(self.food)
         for x in range(width):
@@ -455,7 +605,9 @@ class GameStateData:
         for x, y in self.capsules:
             map[x][y] = 'o'
 
-        return str(map) + ("\nScore: %d\n" % self.score)
+        out = [''.join([map[x][y] for x in range(width)]) for y in range(height)]
+        out.reverse()
+        return '\n'.join(out) + ("\nScore: %d\n" % self.score)
 
     def _foodWallStr( self, hasFood, hasWall ):
         if hasFood:
@@ -503,6 +655,7 @@ class GameStateData:
                 else: numGhosts += 1
             self.agentStates.append( AgentState( Configuration( pos, Directions.STOP), isPacman) )
         self._eaten = [False for a in self.agentStates]
+        self._zobrist = self.computeZobristKey()
 
 try:
     import boinc
@@ -22,6 +22,10 @@ VISIBILITY_MATRIX_CACHE = {}
 class Layout:
     """
     A Layout manages the static information about the game board.
+
+    A Layout never changes once built: game states made from it, and every
+    copy of those states, share the same object, so treat its walls, food,
+    capsules and agent positions as read-only.
     """
 
     def __init__(self, layoutText):
@@ -90,7 +94,8 @@ class Layout:
         return "\n".join(self.layoutText)
 
     def deepCopy(self):
-        return Layout(self.layoutText[:])
+        # Layouts are immutable, so a copy can be the layout itself instead of re-parsing the text.
+        return self
 
     def processLayoutText(self, layoutText):
         """